@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post
+from .models import Category, Job, Location, Post
 
 
 class LocationAdmin(admin.ModelAdmin):
@@ -47,6 +47,22 @@ class PostAdmin(admin.ModelAdmin):
     )
 
 
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'name',
+        'status',
+        'attempts',
+        'run_at',
+        'created_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+
+
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Post, PostAdmin)
+admin.site.register(Job, JobAdmin)
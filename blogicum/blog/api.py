@@ -0,0 +1,215 @@
+from functools import wraps
+
+from django.contrib.auth.models import User
+from django.db.models import Case, F, Q, When
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition, require_safe
+
+from blog.caches import cache_anonymous_page
+from blog.conditional import api_etag
+from blog.models import Category, Comment, Post
+from blog.posts_list import NUMBER_POSTS_LIST, decode_cursor, encode_cursor
+from blog.querysets import (posts, posts_filter_author, posts_filter_full,
+                            visible_to)
+
+NUMBER_COMMENTS_API = 50
+
+# Поле ответа: поле модели или выражение для values().
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': Case(
+        When(location__is_published=True, then=F('location__name'))
+    ),
+    'image': 'image',
+    'comment_count': 'comment_count',
+}
+
+# Текст в ленте не нужен: его отдаёт запрос отдельной публикации.
+POST_LIST_FIELDS = tuple(name for name in POST_FIELDS if name != 'text')
+
+COMMENT_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'created_at': 'created_at',
+    'author': 'author__username',
+}
+
+CATEGORY_FIELDS = {
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+}
+
+PROFILE_FIELDS = {
+    'username': 'username',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'date_joined': 'date_joined',
+}
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def requested_fields(request, spec, default=None):
+    value = request.GET.get('fields')
+    if not value:
+        return tuple(default or spec)
+    fields = tuple(dict.fromkeys(value.split(',')))
+    unknown = [name for name in fields if name not in spec]
+    if unknown:
+        raise FieldsError(f'Неизвестные поля: {", ".join(unknown)}.')
+    return fields
+
+
+def rows(queryset, spec, fields, required=()):
+    # values() отдаёт словари без создания экземпляров моделей;
+    # выражения получают имена с префиксом, чтобы не совпасть с полями.
+    columns = {}
+    lookups, expressions = [], {}
+    for name in dict.fromkeys(fields + tuple(required)):
+        source = spec[name]
+        if isinstance(source, str):
+            columns[name] = source
+            lookups.append(source)
+        else:
+            columns[name] = f'api_{name}'
+            expressions[f'api_{name}'] = source
+    for row in queryset.values(*lookups, **expressions):
+        yield {name: row[column] for name, column in columns.items()}
+
+
+def serialize(row, fields):
+    result = {name: row[name] for name in fields}
+    if 'image' in result:
+        image = result['image']
+        storage = Post.image.field.storage
+        result['image'] = storage.url(image) if image else None
+    return result
+
+
+def next_url(request, cursor):
+    query = request.GET.copy()
+    query['after'] = cursor
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def keyset_page(request, queryset, spec, fields, date_field, limit,
+                descending=True):
+    after = decode_cursor(request.GET.get('after', ''))
+    if after:
+        moment, pk = after
+        if descending:
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__lt': moment})
+                | Q(**{date_field: moment, 'id__lt': pk})
+            )
+        else:
+            queryset = queryset.filter(
+                Q(**{f'{date_field}__gt': moment})
+                | Q(**{date_field: moment, 'id__gt': pk})
+            )
+    page = list(rows(
+        queryset[:limit + 1], spec, fields, required=('id', date_field)
+    ))
+    cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        cursor = encode_cursor(page[-1][date_field], page[-1]['id'])
+    return {
+        'results': [serialize(row, fields) for row in page],
+        'next': cursor and next_url(request, cursor),
+    }
+
+
+def api_view(view):
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return JsonResponse(
+                view(request, *args, **kwargs),
+                json_dumps_params={'ensure_ascii': False},
+            )
+        except FieldsError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Не найдено.'}, status=404)
+
+    return require_safe(wrapper)
+
+
+@condition(etag_func=api_etag)
+@cache_anonymous_page
+@api_view
+def post_list(request):
+    fields = requested_fields(request, POST_FIELDS, POST_LIST_FIELDS)
+    category = request.GET.get('category')
+    author = request.GET.get('author')
+    if author:
+        author = get_object_or_404(User, username=author)
+        queryset = posts_filter_author(author, request.user)
+        if category:
+            queryset = queryset.filter(category__slug=category)
+    elif category:
+        category = get_object_or_404(
+            Category, slug=category, is_published=True
+        )
+        queryset = posts_filter_full(category.id)
+    else:
+        queryset = posts_filter_full()
+    return keyset_page(
+        request, queryset, POST_FIELDS, fields, 'pub_date',
+        NUMBER_POSTS_LIST,
+    )
+
+
+@api_view
+def post_detail(request, pk):
+    fields = requested_fields(request, POST_FIELDS)
+    queryset = posts().filter(visible_to(request.user), pk=pk)
+    for row in rows(queryset, POST_FIELDS, fields):
+        return serialize(row, fields)
+    raise Http404
+
+
+@api_view
+def comment_list(request, pk):
+    fields = requested_fields(request, COMMENT_FIELDS)
+    if not posts().filter(visible_to(request.user), pk=pk).exists():
+        raise Http404
+    queryset = Comment.objects.filter(post_id=pk).order_by('created_at', 'id')
+    return keyset_page(
+        request, queryset, COMMENT_FIELDS, fields, 'created_at',
+        NUMBER_COMMENTS_API, descending=False,
+    )
+
+
+@cache_anonymous_page
+@api_view
+def category_list(request):
+    fields = requested_fields(request, CATEGORY_FIELDS)
+    queryset = Category.objects.filter(is_published=True).order_by('title')
+    return {
+        'results': [
+            serialize(row, fields)
+            for row in rows(queryset, CATEGORY_FIELDS, fields)
+        ],
+    }
+
+
+@api_view
+def profile_detail(request, username):
+    fields = requested_fields(request, PROFILE_FIELDS)
+    queryset = User.objects.filter(username=username)
+    for row in rows(queryset, PROFILE_FIELDS, fields):
+        return serialize(row, fields)
+    raise Http404
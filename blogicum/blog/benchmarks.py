@@ -0,0 +1,124 @@
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.db import connection, transaction
+from django.test import AsyncClient, Client
+from django.utils import timezone
+
+from blog.middleware import QueryRecorder
+from blog.models import Post, make_excerpt
+
+BENCH_HOST = 'localhost'
+# Адрес не входит в INTERNAL_IPS, чтобы в замеры не попадал debug toolbar.
+BENCH_REMOTE_ADDR = '192.0.2.1'
+# AsyncClient всегда передаёт этот заголовок Host: его нужно добавить
+# в ALLOWED_HOSTS на время замеров через ASGI.
+ASGI_BENCH_HOST = 'testserver'
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def bench_client(user=None, asgi=False):
+    if asgi:
+        client = AsyncClient(client=[BENCH_REMOTE_ADDR, 0])
+    else:
+        client = Client(HTTP_HOST=BENCH_HOST, REMOTE_ADDR=BENCH_REMOTE_ADDR)
+    if user is not None:
+        client.force_login(user)
+    return client
+
+
+def create_posts(count, text, title=None, batch_size=1000, **fields):
+    # bulk_create обходит Post.save(), поэтому производные поля
+    # заполняем здесь: без выдержки карточки в замерах были бы пустыми.
+    # text и title могут быть функциями от номера публикации.
+    now = timezone.now()
+    excerpt = None if callable(text) else make_excerpt(text)
+
+    def build(i):
+        post_text = text(i) if callable(text) else text
+        if title is None:
+            post_title = f'Публикация {i}'
+        else:
+            post_title = title(i) if callable(title) else title
+        return Post(
+            title=post_title,
+            text=post_text,
+            excerpt=excerpt or make_excerpt(post_text),
+            pub_date=now - timedelta(minutes=i),
+            is_visible=True,
+            **fields,
+        )
+
+    return Post.objects.bulk_create(
+        (build(i) for i in range(count)), batch_size=batch_size
+    )
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = round(percent / 100 * (len(values) - 1))
+    return values[index]
+
+
+def measure(func, repeat):
+    timings = []
+    queries = []
+    for _ in range(repeat):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(recorder.count)
+    return {
+        'p50_ms': percentile(timings, 50),
+        'p95_ms': percentile(timings, 95),
+        'p99_ms': percentile(timings, 99),
+        'mean_ms': statistics.mean(timings),
+        'queries': max(queries),
+    }
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure_get(client, path, repeat):
+    # Замеряет GET через приложение целиком, от middleware до шаблона;
+    # в результат попадают код и размер последнего ответа.
+    get = client.get
+    if isinstance(client, AsyncClient):
+        async def get_async(path):
+            return await client.get(path)
+        get = async_to_sync(get_async)
+    responses = []
+
+    def request():
+        response = get(path)
+        responses[:] = [response, response_size(response)]
+
+    result = measure(request, repeat)
+    response, size = responses
+    result['status'] = response.status_code
+    result['bytes'] = size
+    return result
+
+
+def format_result(name, result):
+    return (
+        f'{name:<32} p50 {result["p50_ms"]:8.2f} ms  '
+        f'p95 {result["p95_ms"]:8.2f} ms  '
+        f'p99 {result["p99_ms"]:8.2f} ms  '
+        f'запросов {result["queries"]}'
+    )
@@ -0,0 +1,80 @@
+import time
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+
+from blog.routers import primary_reads, read_replica
+
+POSTS_VERSION = 'posts_version'
+PAGES_VERSION = 'pages_version'
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def posts_count(post_list, feed):
+    key = f'posts_count:{get_version(POSTS_VERSION)}:{feed}'
+    count = cache.get(key)
+    if count is None:
+        if settings.POSTS_COUNT_LIMIT:
+            # На одну больше предела: так видно, что предел превышен.
+            post_list = post_list[:settings.POSTS_COUNT_LIMIT + 1]
+        count = post_list.count()
+        if not read_replica():
+            cache.set(key, count, settings.POSTS_COUNT_TIMEOUT)
+    return count
+
+
+def cache_versioned_page(anonymous_only=True):
+
+    def decorator(view):
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or anonymous_only and request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+
+            path = md5(request.get_full_path().encode()).hexdigest()
+            key = f'page:{get_version(PAGES_VERSION)}:{path}'
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            with primary_reads():
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                def store(response):
+                    if read_replica():
+                        return
+                    cache.set(
+                        key, response, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+                    )
+
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.add_post_render_callback(store)
+                else:
+                    store(response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+cache_anonymous_page = cache_versioned_page()
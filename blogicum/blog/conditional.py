@@ -0,0 +1,102 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.caches import PAGES_VERSION, get_version
+from blog.models import Post
+from blog.querysets import filter_posts
+from blog.routers import primary_reads, read_replica
+from blog.sitemaps import sitemap_generation, sitemap_key, site_url
+
+
+def make_etag(*parts):
+    return md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def feed_etag(request, *args, **kwargs):
+    # Дата последней публикации кешируется под текущей версией страниц,
+    # чтобы ответ из кеша страниц обходился без запросов к БД.
+    version = get_version(PAGES_VERSION)
+    key = f'feed_etag:{version}'
+    last_pub_date = cache.get(key)
+    if last_pub_date is None:
+        with primary_reads():
+            last_pub_date = filter_posts(Post.objects).order_by(
+                '-pub_date'
+            ).values_list('pub_date', flat=True).first() or ''
+        if not read_replica():
+            cache.set(
+                key, last_pub_date, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+            )
+    return make_etag(version, last_pub_date, request.user.pk)
+
+
+def api_etag(request, *args, **kwargs):
+    # Ответ API зависит от параметров запроса: курсора, фильтров и полей.
+    return make_etag(feed_etag(request), request.get_full_path())
+
+
+def post_validators(request, pk):
+    if not hasattr(request, '_post_validators'):
+        request._post_validators = Post.objects.filter(pk=pk).values_list(
+            'updated_at', 'pub_date'
+        ).first()
+    return request._post_validators
+
+
+def post_etag(request, pk):
+    validators = post_validators(request, pk)
+    if validators is None:
+        return None
+    updated_at, pub_date = validators
+    return make_etag(updated_at, pub_date <= timezone.now(), request.user.pk)
+
+
+def post_last_modified(request, pk):
+    validators = post_validators(request, pk)
+    if validators is None:
+        return None
+    return validators[0]
+
+
+def syndication_validators(request, category_slug=None, username=None):
+    if not hasattr(request, '_syndication_validators'):
+        version = get_version(PAGES_VERSION)
+        feed = f'{category_slug}:{username}'
+        key = f'syndication:{version}:{md5(feed.encode()).hexdigest()}'
+        validators = cache.get(key)
+        if validators is None:
+            posts = filter_posts(Post.objects)
+            if category_slug is not None:
+                posts = posts.filter(category__slug=category_slug)
+            if username is not None:
+                posts = posts.filter(author__username=username)
+            with primary_reads():
+                last_modified = posts.aggregate(
+                    last_modified=Max('updated_at')
+                )['last_modified']
+            validators = (make_etag(version, feed), last_modified)
+            if not read_replica():
+                cache.set(
+                    key, validators, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT
+                )
+        request._syndication_validators = validators
+    return request._syndication_validators
+
+
+def syndication_etag(request, **kwargs):
+    return syndication_validators(request, **kwargs)[0]
+
+
+def syndication_last_modified(request, **kwargs):
+    return syndication_validators(request, **kwargs)[1]
+
+
+def sitemap_etag(request, section='index', shard=None):
+    # Тот же ключ, под которым файл лежит в кеше.
+    parts = (section,) if shard is None else (section, shard)
+    key = sitemap_key(site_url(request), *parts)
+    return make_etag(key, sitemap_generation(key))
@@ -0,0 +1,238 @@
+import random
+from datetime import timedelta
+from functools import lru_cache
+from itertools import accumulate
+
+from django.db import connection
+
+from blog.models import Category, Comment, Location, Post, User, make_excerpt
+
+SYLLABLES = (
+    'ка', 'ро', 'ми', 'ту', 'ле', 'на', 'ст', 'во', 'ри', 'да',
+    'по', 'ве', 'се', 'ло', 'ны', 'жи', 'ба', 'го', 'за', 'ку',
+)
+
+FIRST_NAMES = (
+    'Анна', 'Борис', 'Вера', 'Глеб', 'Дарья', 'Егор', 'Жанна', 'Зоя',
+    'Иван', 'Кира', 'Лев', 'Мария', 'Никита', 'Ольга', 'Пётр', 'Роман',
+)
+
+LAST_NAMES = (
+    'Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров',
+    'Соколов', 'Михайлов', 'Новиков', 'Фёдоров', 'Морозов', 'Волков',
+)
+
+CHUNK_SIZE = 10_000
+
+VOCABULARY_SIZE = 20_000
+
+# Публикации равномерно распределены по последним HISTORY дням.
+HISTORY = timedelta(days=3 * 365)
+
+# Отложенные публикации выходят в течение SCHEDULE дней.
+SCHEDULE = timedelta(days=30)
+
+# Каждая UNPUBLISHED_CATEGORY_EVERY-я категория снята с публикации.
+UNPUBLISHED_CATEGORY_EVERY = 10
+
+# Показатели степенных распределений: чем больше, тем сильнее перекос
+# в пользу первых по порядку авторов, публикаций и слов.
+AUTHOR_SKEW = 1.1
+COMMENT_SKEW = 1.0
+CATEGORY_SKEW = 0.8
+WORD_SKEW = 1.0
+
+MODELS = {
+    'locations': Location,
+    'categories': Category,
+    'users': User,
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+def vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+@lru_cache(maxsize=None)
+def zipf_weights(count, exponent):
+    # Накопленные веса для random.choices: выбор по ним — двоичный поиск.
+    return list(accumulate(
+        1 / rank ** exponent for rank in range(1, count + 1)
+    ))
+
+
+@lru_cache(maxsize=None)
+def words(seed):
+    return vocabulary(random.Random(f'{seed}:words'), VOCABULARY_SIZE)
+
+
+def sentence(rng, seed, length):
+    return ' '.join(rng.choices(
+        words(seed), cum_weights=zipf_weights(VOCABULARY_SIZE, WORD_SKEW),
+        k=length,
+    ))
+
+
+def post_pub_date(plan, index):
+    # Дата выводится из номера публикации, чтобы генератор комментариев
+    # знал её, не читая базу.
+    posts = plan['posts']
+    scheduled = int(posts * plan['scheduled'])
+    published = posts - scheduled
+    if index < published:
+        return plan['now'] - HISTORY * (1 - index / published)
+    return plan['now'] + SCHEDULE * ((index - published + 1) / scheduled)
+
+
+def category_published(index):
+    return (index + 1) % UNPUBLISHED_CATEGORY_EVERY != 0
+
+
+def location_rows(plan, rng, start, stop):
+    for index in range(start, stop):
+        yield {
+            'id': plan['first_ids']['locations'] + index,
+            'name': f'Место {index + 1}',
+            'is_published': rng.random() > 0.1,
+            'created_at': plan['now'] - HISTORY,
+        }
+
+
+def category_rows(plan, rng, start, stop):
+    first_id = plan['first_ids']['categories']
+    for index in range(start, stop):
+        yield {
+            'id': first_id + index,
+            'title': sentence(rng, plan['seed'], rng.randint(1, 3)).title(),
+            'description': sentence(rng, plan['seed'], rng.randint(10, 30)),
+            'slug': f'{plan["prefix"]}-{first_id + index}',
+            'is_published': category_published(index),
+            'created_at': plan['now'] - HISTORY,
+        }
+
+
+def user_rows(plan, rng, start, stop):
+    first_id = plan['first_ids']['users']
+    for index in range(start, stop):
+        username = f'{plan["prefix"]}_{first_id + index}'
+        yield {
+            'id': first_id + index,
+            'username': username,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'email': f'{username}@example.com',
+            'password': plan['password'],
+            'date_joined': plan['now'] - HISTORY * rng.random(),
+        }
+
+
+def post_rows(plan, rng, start, stop):
+    first_ids = plan['first_ids']
+    authors = zipf_weights(plan['users'], AUTHOR_SKEW)
+    categories = zipf_weights(plan['categories'], CATEGORY_SKEW)
+    for index in range(start, stop):
+        pub_date = post_pub_date(plan, index)
+        category = rng.choices(
+            range(plan['categories']), cum_weights=categories
+        )[0]
+        location = None
+        if plan['locations'] and rng.random() > 0.3:
+            location = first_ids['locations'] + rng.randrange(
+                plan['locations']
+            )
+        # Длина текста — логнормальная: много коротких, мало длинных.
+        length = min(max(int(rng.lognormvariate(4.5, 0.7)), 5), 3000)
+        text = sentence(rng, plan['seed'], length)
+        is_published = rng.random() > plan['unpublished']
+        yield {
+            'id': first_ids['posts'] + index,
+            'title': sentence(rng, plan['seed'], rng.randint(2, 8)),
+            'text': text,
+            'excerpt': make_excerpt(text),
+            'pub_date': pub_date,
+            'created_at': min(pub_date, plan['now']),
+            'updated_at': min(pub_date, plan['now']),
+            'author_id': first_ids['users'] + rng.choices(
+                range(plan['users']), cum_weights=authors
+            )[0],
+            'category_id': first_ids['categories'] + category,
+            'location_id': location,
+            'is_published': is_published,
+            'is_visible': (
+                is_published
+                and pub_date <= plan['now']
+                and category_published(category)
+            ),
+        }
+
+
+def comment_rows(plan, rng, start, stop):
+    first_ids = plan['first_ids']
+    # Комментируют только вышедшие публикации, и больше всего — первые
+    # из них: это «вирусные» публикации с тысячами комментариев.
+    posts = plan['posts'] - int(plan['posts'] * plan['scheduled'])
+    weights = zipf_weights(posts, COMMENT_SKEW)
+    for index in range(start, stop):
+        post = rng.choices(range(posts), cum_weights=weights)[0]
+        created_at = min(
+            post_pub_date(plan, post)
+            + timedelta(days=rng.expovariate(1 / 2)),
+            plan['now'],
+        )
+        yield {
+            'id': first_ids['comments'] + index,
+            'post_id': first_ids['posts'] + post,
+            'author_id': first_ids['users'] + rng.randrange(plan['users']),
+            'text': sentence(rng, plan['seed'], rng.randint(3, 40)),
+            'created_at': created_at,
+        }
+
+
+ROWS = {
+    'locations': location_rows,
+    'categories': category_rows,
+    'users': user_rows,
+    'posts': post_rows,
+    'comments': comment_rows,
+}
+
+
+def insert_sql(model):
+    fields = model._meta.concrete_fields
+    columns = ', '.join(
+        connection.ops.quote_name(field.column) for field in fields
+    )
+    placeholders = ', '.join(['%s'] * len(fields))
+    return (
+        f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} '
+        f'({columns}) VALUES ({placeholders})'
+    )
+
+
+def generate_chunk(plan, kind, start, stop):
+    # Каждая пачка получает свой генератор случайных чисел, поэтому
+    # данные не зависят от числа процессов и порядка их работы.
+    rng = random.Random(f'{plan["seed"]}:{kind}:{start}')
+    fields = MODELS[kind]._meta.concrete_fields
+    rows = []
+    for values in ROWS[kind](plan, rng, start, stop):
+        rows.append(tuple(
+            field.get_db_prep_save(
+                values[field.attname] if field.attname in values
+                else field.get_default(),
+                connection,
+            )
+            for field in fields
+        ))
+    return kind, rows
+
+
+def chunks(plan, chunk_size=CHUNK_SIZE):
+    for kind in ROWS:
+        for start in range(0, plan[kind], chunk_size):
+            yield kind, start, min(start + chunk_size, plan[kind])
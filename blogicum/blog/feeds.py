@@ -0,0 +1,116 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from blog.caches import cache_versioned_page
+from blog.conditional import syndication_etag, syndication_last_modified
+from blog.models import Category, User
+from blog.querysets import filter_posts, posts, posts_filter_full
+
+NUMBER_FEED_ITEMS = 20
+
+
+class PostsFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def items(self):
+        # В RSS и Atom уходит полный текст публикации.
+        return posts_filter_full().defer(None)[:NUMBER_FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=(item.id,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('blog:profile', args=(item.author.username,))
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryPostsFeed(PostsFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def items(self, obj):
+        return posts_filter_full(obj.id).defer(None)[:NUMBER_FEED_ITEMS]
+
+
+class AuthorPostsFeed(PostsFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации {obj.username}'
+
+    def description(self, obj):
+        return f'Новые публикации пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.username,))
+
+    def items(self, obj):
+        # Лента автора одинакова для всех, включая самого автора.
+        return filter_posts(posts().filter(author=obj))[:NUMBER_FEED_ITEMS]
+
+
+class AtomFeedMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class AtomPostsFeed(AtomFeedMixin, PostsFeed):
+    pass
+
+
+class AtomCategoryPostsFeed(AtomFeedMixin, CategoryPostsFeed):
+    pass
+
+
+class AtomAuthorPostsFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
+
+
+def feed_view(feed_class):
+    # Ленты одинаковы для всех читателей, поэтому кешируются и для
+    # авторизованных пользователей.
+    view = cache_versioned_page(anonymous_only=False)(feed_class())
+    return condition(
+        etag_func=syndication_etag,
+        last_modified_func=syndication_last_modified,
+    )(view)
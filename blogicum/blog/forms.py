@@ -1,6 +1,8 @@
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
+from django.template import loader
 
-
+from .jobs import enqueue
 from .models import Post, User, Comment
 
 
@@ -25,3 +27,22 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = loader.render_to_string(subject_template_name, context)
+        html = None
+        if html_email_template_name is not None:
+            html = loader.render_to_string(html_email_template_name, context)
+        # Письмо отправит воркер, чтобы запрос не ждал почтовый сервер.
+        enqueue('send_email', {
+            'subject': ''.join(subject.splitlines()),
+            'body': loader.render_to_string(email_template_name, context),
+            'from_email': from_email,
+            'to': [to_email],
+            'html': html,
+        })
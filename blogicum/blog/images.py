@@ -0,0 +1,98 @@
+import re
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+THUMBNAIL_WIDTHS = (320, 640, 960)
+
+# Расширение файла и формат Pillow для каждого варианта.
+THUMBNAIL_FORMATS = (
+    ('jpg', 'JPEG'),
+    ('webp', 'WEBP'),
+)
+
+THUMBNAIL_QUALITY = 80
+
+THUMBNAIL_SUFFIX = re.compile(r'_\d+w$')
+
+
+def thumbnail_name(name, width, extension):
+    path = PurePosixPath(name)
+    return str(path.with_name(f'{path.stem}_{width}w.{extension}'))
+
+
+def image_key(name):
+    return str(PurePosixPath(name).with_suffix(''))
+
+
+def original_key(name):
+    # Ключ оригинала, из которого могла быть получена копия.
+    path = PurePosixPath(name)
+    return str(path.with_name(THUMBNAIL_SUFFIX.sub('', path.stem)))
+
+
+def thumbnail_names(name):
+    return [
+        thumbnail_name(name, width, extension)
+        for width in THUMBNAIL_WIDTHS
+        for extension, _ in THUMBNAIL_FORMATS
+    ]
+
+
+def srcset(storage, name, extension):
+    return ', '.join(
+        f'{storage.url(thumbnail_name(name, width, extension))} {width}w'
+        for width in THUMBNAIL_WIDTHS
+    )
+
+
+def resize(image, width):
+    # Картинки уже нужной ширины не увеличиваем, только перекодируем.
+    if image.width <= width:
+        return image.copy()
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def encode(image, image_format):
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    data = BytesIO()
+    image.save(
+        data, image_format, quality=THUMBNAIL_QUALITY, optimize=True
+    )
+    return ContentFile(data.getvalue())
+
+
+def generate_thumbnails(storage, name, overwrite=True):
+    targets = [
+        (width, image_format, thumbnail_name(name, width, extension))
+        for width in THUMBNAIL_WIDTHS
+        for extension, image_format in THUMBNAIL_FORMATS
+    ]
+    if not overwrite:
+        # Копии одинаковых картинок совпадают, их не нужно пересоздавать.
+        targets = [item for item in targets if not storage.exists(item[2])]
+        if not targets:
+            return []
+    with storage.open(name) as file:
+        with Image.open(file) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    resized = {}
+    created = []
+    for width, image_format, target in targets:
+        if width not in resized:
+            resized[width] = resize(image, width)
+        if storage.exists(target):
+            storage.delete(target)
+        # Имя копии выводится из имени оригинала по хешу, и хранилище
+        # сохраняет его как есть.
+        created.append(
+            storage.save(target, encode(resized[width], image_format))
+        )
+    return created
@@ -0,0 +1,100 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+CLAIM_BATCH_SIZE = 20
+
+
+def task(func):
+    TASKS[func.__name__] = func
+    return func
+
+
+def enqueue(name, payload=None, run_at=None):
+    # Задача пишется в той же транзакции, что и изменения,
+    # поэтому воркер увидит её только после их фиксации.
+    if name not in TASKS:
+        raise KeyError(f'Неизвестная задача: {name}')
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def requeue_stale():
+    stale = timezone.now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    jobs = Job.objects.filter(status=Job.RUNNING, locked_at__lt=stale)
+    # Попытка зависшего воркера уже учтена в claim(); задача, которая
+    # раз за разом роняет воркер, не должна крутиться бесконечно.
+    failed = jobs.filter(attempts__gte=settings.JOBS_MAX_ATTEMPTS).update(
+        status=Job.FAILED, locked_at=None,
+        last_error='Воркер не завершил задачу за JOBS_LOCK_TIMEOUT.',
+    )
+    if failed:
+        logger.error('Зависших задач снято после всех попыток: %s', failed)
+    return jobs.update(status=Job.QUEUED, locked_at=None)
+
+
+def claim(limit):
+    now = timezone.now()
+    ids = list(
+        Job.objects.filter(status=Job.QUEUED, run_at__lte=now)
+        .values_list('pk', flat=True)[:limit]
+    )
+    if not ids:
+        return []
+    # Условный UPDATE не даст двум воркерам взять одну задачу.
+    Job.objects.filter(pk__in=ids, status=Job.QUEUED).update(
+        status=Job.RUNNING, locked_at=now, attempts=F('attempts') + 1
+    )
+    return list(
+        Job.objects.filter(pk__in=ids, status=Job.RUNNING, locked_at=now)
+    )
+
+
+def run_job(job):
+    try:
+        TASKS[job.name](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= settings.JOBS_MAX_ATTEMPTS:
+            job.status = Job.FAILED
+            logger.error('Задача %s не выполнена:\n%s', job, job.last_error)
+        else:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + retry_delay(job.attempts)
+        job.locked_at = None
+        job.save(update_fields=('status', 'run_at', 'locked_at', 'last_error'))
+        return False
+    return True
+
+
+def run_pending(limit=None):
+    requeue_stale()
+    processed = 0
+    while limit is None or processed < limit:
+        size = CLAIM_BATCH_SIZE
+        if limit is not None:
+            size = min(size, limit - processed)
+        jobs = claim(size)
+        if not jobs:
+            break
+        done = [job.pk for job in jobs if run_job(job)]
+        Job.objects.filter(pk__in=done).delete()
+        processed += len(jobs)
+    return processed
@@ -0,0 +1,271 @@
+import bz2
+import gzip
+import json
+import re
+from collections import Counter, defaultdict
+
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import connections, transaction
+
+from blog.caches import PAGES_VERSION, POSTS_VERSION, bump_version
+from blog.maintenance import recount_comments, refresh_visibility
+from blog.models import Comment, Post, make_excerpt
+from blog.search import install_search, uninstall_search
+
+READ_SIZE = 1 << 16
+
+BATCH_SIZE = 1000
+
+OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+}
+
+WHITESPACE = re.compile(r'\s*')
+
+decoder = json.JSONDecoder()
+
+
+def open_fixture(path):
+    for suffix, opener in OPENERS.items():
+        if str(path).endswith(suffix):
+            return opener(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def iter_objects(stream, read_size=READ_SIZE):
+    # Разбирает массив JSON по одному элементу: в памяти не больше
+    # одного объекта и одного прочитанного блока.
+    buffer = ''
+    position = 0
+    started = False
+    error = ValueError('Фикстура оборвалась до конца массива.')
+    while True:
+        position = WHITESPACE.match(buffer, position).end()
+        if position < len(buffer):
+            char = buffer[position]
+            if not started:
+                if char != '[':
+                    raise ValueError('Фикстура должна быть массивом JSON.')
+                started = True
+                position += 1
+                continue
+            if char == ']':
+                return
+            if char == ',':
+                position += 1
+                continue
+            try:
+                obj, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as decode_error:
+                # Объект не поместился в буфер: дочитываем файл.
+                error = decode_error
+            else:
+                yield obj
+                continue
+        chunk = stream.read(read_size)
+        if not chunk:
+            raise error
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def dependencies(model, models):
+    return {
+        field.related_model._meta.concrete_model
+        for field in model._meta.concrete_fields
+        if field.is_relation
+    } & models - {model}
+
+
+def dependency_order(models):
+    # Сначала модели, на которые ссылаются остальные. Циклы допустимы:
+    # внешние ключи проверяются в конце загрузки.
+    models = set(models)
+    ordered = []
+    while models:
+        ready = {
+            model for model in models
+            if not dependencies(model, models)
+        } or {min(models, key=lambda model: model._meta.label)}
+        ordered += sorted(ready, key=lambda model: model._meta.label)
+        models -= ready
+    return ordered
+
+
+class FixtureLoader:
+
+    def __init__(self, using='default', batch_size=BATCH_SIZE):
+        self.using = using
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.relations = defaultdict(list)
+        self.buffered = 0
+        self.counts = Counter()
+        self.indexes = []
+        self.search_deferred = False
+
+    @property
+    def models(self):
+        return set(self.counts)
+
+    def add(self, deserialized):
+        obj = deserialized.object
+        model = type(obj)
+        if model._meta.parents:
+            # bulk_create не умеет наследование с несколькими таблицами.
+            deserialized.save(using=self.using)
+            self.counts[model] += 1
+            return
+        if model is Post and not obj.excerpt:
+            # Дешевле посчитать здесь, чем обновлять строки после вставки.
+            obj.excerpt = make_excerpt(obj.text)
+        self.pending[model].append(obj)
+        for name, pks in (deserialized.m2m_data or {}).items():
+            self.relations[model._meta.get_field(name)].append((obj, pks))
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model in dependency_order(self.pending):
+            self.save(model, self.pending.pop(model))
+        for field, rows in self.relations.items():
+            self.save_relations(field, rows)
+        self.relations.clear()
+        self.buffered = 0
+
+    def save(self, model, objects):
+        if model not in self.counts:
+            self.defer_indexes(model)
+        # Как loaddata: строка с тем же ключом перезаписывается,
+        # из повторов в одной фикстуре побеждает последний.
+        unique = {obj.pk: obj for obj in objects if obj.pk is not None}
+        objects = list(unique.values()) + [
+            obj for obj in objects if obj.pk is None
+        ]
+        manager = model._base_manager.using(self.using)
+        existing = set(
+            manager.filter(pk__in=unique).values_list('pk', flat=True)
+        )
+        self.insert(model, [obj for obj in objects if obj.pk not in existing])
+        if existing:
+            manager.bulk_update(
+                [unique[pk] for pk in existing],
+                [
+                    field.name for field in model._meta.concrete_fields
+                    if not field.primary_key
+                ],
+                batch_size=self.batch_size,
+            )
+        self.counts[model] += len(objects)
+
+    def insert(self, model, objects):
+        # Как при raw-сохранении в loaddata: значения берутся из фикстуры
+        # как есть, bulk_create перезаписал бы поля с auto_now_add.
+        manager = model._base_manager.using(self.using)
+        fields = model._meta.concrete_fields
+        for with_pk in (True, False):
+            rows = [obj for obj in objects if (obj.pk is not None) == with_pk]
+            columns = [
+                field for field in fields if with_pk or not field.primary_key
+            ]
+            size = min(
+                self.batch_size,
+                self.connection.ops.bulk_batch_size(columns, rows) or 1,
+            )
+            for start in range(0, len(rows), size):
+                manager._insert(
+                    rows[start:start + size],
+                    fields=columns,
+                    using=self.using,
+                    raw=True,
+                )
+
+    def save_relations(self, field, rows):
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        manager = through._base_manager.using(self.using)
+        manager.filter(
+            **{f'{source}__in': [obj.pk for obj, _ in rows]}
+        ).delete()
+        manager.bulk_create(
+            [
+                through(**{f'{source}_id': obj.pk, f'{target}_id': pk})
+                for obj, pks in rows
+                for pk in pks
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def defer_indexes(self, model):
+        # Неуникальные индексы выгоднее построить один раз после вставки,
+        # чем обновлять на каждой строке. Пока только для SQLite.
+        if self.connection.vendor != 'sqlite':
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = %s AND sql IS NOT NULL "
+                "AND sql NOT LIKE 'CREATE UNIQUE%%'",
+                [model._meta.db_table],
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX "{name}"')
+        self.indexes += indexes
+        if model is Post:
+            # Без триггеров индекс поиска перестраивается целиком.
+            uninstall_search(self.connection)
+            self.search_deferred = True
+
+    def restore_indexes(self):
+        with self.connection.cursor() as cursor:
+            for _, sql in self.indexes:
+                cursor.execute(sql)
+        self.indexes = []
+        if self.search_deferred:
+            install_search(self.connection)
+            self.search_deferred = False
+
+
+def load_fixture(path, using='default', batch_size=BATCH_SIZE,
+                 ignorenonexistent=False):
+    connection = connections[using]
+    loader = FixtureLoader(using, batch_size)
+    with transaction.atomic(using=using):
+        with connection.constraint_checks_disabled():
+            with open_fixture(path) as stream:
+                for deserialized in Deserializer(
+                    iter_objects(stream),
+                    using=using,
+                    ignorenonexistent=ignorenonexistent,
+                ):
+                    loader.add(deserialized)
+            loader.flush()
+            loader.restore_indexes()
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in loader.models]
+        )
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), loader.models
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+    return loader.counts
+
+
+def rebuild_derived(models, using='default'):
+    # bulk_create обходит Post.save() и сигналы, поэтому видимость
+    # и счётчики комментариев пересчитываются после загрузки;
+    # анонсы заполняет FixtureLoader.add().
+    if Post in models:
+        refresh_visibility(using=using)
+    if Post in models or Comment in models:
+        recount_comments(using=using)
+    bump_version(POSTS_VERSION, PAGES_VERSION)
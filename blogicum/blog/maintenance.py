@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog.caches import PAGES_VERSION, bump_version
+from blog.images import (
+    generate_thumbnails, image_key, original_key, thumbnail_names
+)
+from blog.models import Post, make_excerpt
+from blog.querysets import comment_total, visible
+from blog.signals import posts_published
+
+
+def batches(queryset, batch_size):
+    last_id = 0
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield ids
+
+
+def recount_comments(batch_size=1000, using='default'):
+    comments = comment_total()
+    posts = Post.objects.using(using)
+    repaired = 0
+    for ids in batches(posts, batch_size):
+        with transaction.atomic(using=using):
+            repaired += posts.filter(pk__in=ids).annotate(
+                actual_count=comments
+            ).exclude(
+                comment_count=F('actual_count')
+            ).update(comment_count=comments)
+    return repaired
+
+
+def fill_excerpts(batch_size=1000, only_missing=True):
+    posts = Post.objects.all()
+    if only_missing:
+        posts = posts.filter(excerpt='')
+    filled = 0
+    for ids in batches(posts, batch_size):
+        rows = Post.objects.filter(pk__in=ids).values_list('pk', 'text')
+        changed = [
+            Post(pk=pk, excerpt=make_excerpt(text)) for pk, text in rows
+        ]
+        with transaction.atomic():
+            Post.objects.bulk_update(changed, ('excerpt',))
+        filled += len(changed)
+    return filled
+
+
+def publish_scheduled(batch_size=1000):
+    now = timezone.now()
+    scheduled = Post.objects.filter(visible(now), is_visible=False)
+    published = []
+    for ids in batches(scheduled, batch_size):
+        with transaction.atomic():
+            # Условие видимости проверяется в самом UPDATE: публикация,
+            # снятая после выборки идентификаторов, не откроется.
+            scheduled.filter(pk__in=ids).update(
+                is_visible=True, updated_at=now
+            )
+            post_ids = list(
+                Post.objects.filter(pk__in=ids, is_visible=True)
+                .values_list('pk', flat=True)
+            )
+        if post_ids:
+            posts_published.send(sender=Post, post_ids=post_ids)
+            published += post_ids
+    return published
+
+
+def refresh_visibility(batch_size=1000, using='default'):
+    now = timezone.now()
+    changed = 0
+    for ids in batches(Post.objects.using(using), batch_size):
+        posts = Post.objects.using(using).filter(pk__in=ids)
+        with transaction.atomic(using=using):
+            changed += posts.filter(visible(now), is_visible=False).update(
+                is_visible=True, updated_at=now
+            )
+            changed += posts.filter(~visible(now), is_visible=True).update(
+                is_visible=False, updated_at=now
+            )
+    if changed:
+        posts_published.send(sender=Post, post_ids=None)
+    return changed
+
+
+def images_without_thumbnails(force=False):
+    posts = Post.objects.exclude(image='')
+    if not force:
+        posts = posts.exclude(thumbnails_image=F('image'))
+    return list(
+        posts.order_by('image').values_list('image', flat=True).distinct()
+    )
+
+
+def image_storage():
+    return Post._meta.get_field('image').storage
+
+
+def build_thumbnails(name, overwrite=True):
+    generate_thumbnails(image_storage(), name, overwrite)
+    return name
+
+
+def mark_thumbnails(names):
+    marked = Post.objects.filter(image__in=names).update(
+        thumbnails_image=F('image'), updated_at=timezone.now()
+    )
+    if marked:
+        bump_version(PAGES_VERSION)
+    return marked
+
+
+def is_fresh(storage, name):
+    age = timezone.now() - storage.get_modified_time(name)
+    return age < timedelta(seconds=settings.ORPHAN_IMAGE_GRACE_PERIOD)
+
+
+def collect_image(name):
+    key = image_key(name)
+    # Копии общие у картинок с одним ключом, например x.jpg и x.png.
+    # Диапазон вместо startswith, чтобы поиск шёл по индексу:
+    # «/» следует за «.» в таблице символов.
+    references = Post.objects.filter(
+        image__gte=f'{key}.', image__lt=f'{key}/'
+    )
+    if references.exists():
+        return False
+    storage = image_storage()
+    if storage.exists(name):
+        if is_fresh(storage, name):
+            return False
+        storage.delete(name)
+    for thumbnail in thumbnail_names(name):
+        if storage.exists(thumbnail):
+            storage.delete(thumbnail)
+    return True
+
+
+def walk_storage(storage, directory):
+    directories, files = storage.listdir(directory)
+    for file in files:
+        yield f'{directory}/{file}'
+    for child in directories:
+        yield from walk_storage(storage, f'{directory}/{child}')
+
+
+def collect_orphan_images(dry_run=False):
+    storage = image_storage()
+    directory = Post._meta.get_field('image').upload_to.strip('/')
+    if not storage.exists(directory):
+        return []
+    referenced = {
+        image_key(name) for name in
+        Post.objects.exclude(image='')
+        .values_list('image', flat=True).iterator()
+    }
+    removed = []
+    for name in walk_storage(storage, directory):
+        if (image_key(name) in referenced
+                or original_key(name) in referenced
+                or is_fresh(storage, name)):
+            continue
+        if not dry_run:
+            storage.delete(name)
+        removed.append(name)
+    return removed
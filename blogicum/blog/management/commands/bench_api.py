@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from blog.benchmarks import (
+    bench_client, create_posts, format_result, measure, rolled_back
+)
+from blog.models import Category, Comment, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость JSON API и HTML-страниц на одних и тех же '
+        'данных. Данные создаются во временной транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--text-size', type=int, default=5_000)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            author = User.objects.create(username='bench_author')
+            category = Category.objects.create(
+                title='Бенчмарк', description='Бенчмарк', slug='bench'
+            )
+            text = 'Текст публикации. ' * (options['text_size'] // 18)
+            create_posts(
+                options['posts'], text, batch_size=2000,
+                author=author, category=category,
+            )
+            post = Post.objects.order_by('-pub_date').first()
+            Comment.objects.bulk_create(
+                Comment(post=post, author=author, text=f'Комментарий {i}')
+                for i in range(50)
+            )
+
+            # Анонимные ответы кешируются, поэтому замеряем под
+            # пользователем: так каждый запрос доходит до базы.
+            client = bench_client(author)
+            urls = {
+                'лента [HTML]': '/',
+                'лента [API]': '/api/posts/',
+                'лента [API, ?fields=id,title]': (
+                    '/api/posts/?fields=id,title'
+                ),
+                'категория [HTML]': '/category/bench/',
+                'категория [API]': '/api/posts/?category=bench',
+                'публикация [HTML]': f'/posts/{post.id}/',
+                'публикация [API]': f'/api/posts/{post.id}/',
+            }
+            for name, url in urls.items():
+                result = measure(lambda: client.get(url), options['repeat'])
+                rate = 1000 / result['mean_ms']
+                self.stdout.write(
+                    format_result(name, result) + f'  {rate:7.0f} запр./с'
+                )
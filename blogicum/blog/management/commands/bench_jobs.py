@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.benchmarks import rolled_back
+from blog.jobs import enqueue, run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет пропускную способность очереди фоновых задач: '
+        'постановку и выполнение пустых задач. Задачи создаются во '
+        'временной транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        jobs = options['jobs']
+        with rolled_back():
+            start = time.perf_counter()
+            for _ in range(jobs):
+                enqueue('noop')
+            enqueued = time.perf_counter() - start
+
+            start = time.perf_counter()
+            processed = run_pending()
+            drained = time.perf_counter() - start
+
+        self.stdout.write(
+            f'Постановка: {jobs / enqueued:10.0f} задач/с\n'
+            f'Выполнение: {processed / drained:10.0f} задач/с'
+        )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from blog.benchmarks import (
+    bench_client, create_posts, format_result, measure, rolled_back
+)
+from blog.models import Category, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет число запросов и время ответа страницы профиля автора '
+        'с большим числом публикаций. Данные создаются во временной '
+        'транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            author = User.objects.create(username='bench_author')
+            visitor = User.objects.create(username='bench_visitor')
+            category = Category.objects.create(
+                title='Бенчмарк', description='Бенчмарк', slug='bench'
+            )
+            create_posts(
+                options['posts'], 'Текст публикации',
+                author=author, category=category,
+            )
+
+            url = f'/profile/{author.username}/'
+            for name, client in (
+                ('автор', bench_client(author)),
+                ('посетитель', bench_client(visitor)),
+                ('аноним', bench_client()),
+            ):
+                client.get(url)
+                result = measure(lambda: client.get(url), options['repeat'])
+                self.stdout.write(format_result(f'{url} ({name})', result))
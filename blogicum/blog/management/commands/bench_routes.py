@@ -0,0 +1,268 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from blog.benchmarks import (
+    ASGI_BENCH_HOST, bench_client, create_posts, format_result, measure_get,
+    rolled_back,
+)
+from blog.models import Category, Comment, Location, Post, User
+
+# Админка и debug toolbar не входят в замеры.
+EXCLUDED_NAMESPACES = {'admin', 'djdt'}
+
+# Выход из аккаунта завершил бы сессию пользователя после первого
+# же запроса, поэтому он замеряется только для анонима.
+ANONYMOUS_ONLY = {'logout'}
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+def route_names(patterns=None, prefix=''):
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in EXCLUDED_NAMESPACES:
+                continue
+            namespace = prefix
+            if pattern.namespace:
+                namespace += f'{pattern.namespace}:'
+            yield from route_names(pattern.url_patterns, namespace)
+        elif pattern.name:
+            yield prefix + pattern.name
+
+
+def route_paths(author, reader, category, post, comment):
+    # Ссылка сброса пароля — для пользователя, который не входит:
+    # вход меняет last_login, и токен перестаёт действовать.
+    uidb64 = urlsafe_base64_encode(force_bytes(reader.pk))
+    token = default_token_generator.make_token(reader)
+    routes = {
+        'blog:index': {},
+        'blog:sitemap': {},
+        'blog:sitemap_section': {'section': 'posts', 'shard': 0},
+        'blog:feed_rss': {},
+        'blog:feed_atom': {},
+        'blog:api_post_list': {},
+        'blog:api_post_detail': {'pk': post.id},
+        'blog:api_comment_list': {'pk': post.id},
+        'blog:api_category_list': {},
+        'blog:api_profile_detail': {'username': author.username},
+        'blog:create_post': {},
+        'blog:edit_post': {'post_id': post.id},
+        'blog:delete_post': {'post_id': post.id},
+        'blog:post_detail': {'pk': post.id},
+        'blog:category_posts': {'category_slug': category.slug},
+        'blog:category_feed_rss': {'category_slug': category.slug},
+        'blog:category_feed_atom': {'category_slug': category.slug},
+        'blog:profile': {'username': author.username},
+        'blog:author_feed_rss': {'username': author.username},
+        'blog:author_feed_atom': {'username': author.username},
+        'blog:edit_profile': {'username': author.username},
+        'blog:add_comment': {'post_id': post.id},
+        'blog:edit_comment': {'post_id': post.id, 'comment_id': comment.id},
+        'blog:delete_comment': {
+            'post_id': post.id, 'comment_id': comment.id
+        },
+        'pages:about': {},
+        'pages:rules': {},
+        'login': {},
+        'logout': {},
+        'password_change': {},
+        'password_change_done': {},
+        'password_reset': {},
+        'password_reset_done': {},
+        'password_reset_confirm': {'uidb64': uidb64, 'token': token},
+        'password_reset_complete': {},
+        'registration': {},
+    }
+    paths = {
+        name: reverse(name, kwargs=kwargs) for name, kwargs in routes.items()
+    }
+    paths['blog:search'] = (
+        reverse('blog:search') + '?q=' + post.text.split()[0]
+    )
+    return paths
+
+
+def regressions(results, baseline, metric, threshold, min_delta_ms):
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['status'] != base['status']:
+            yield name, f'код ответа {base["status"]} → {result["status"]}'
+        if result['queries'] > base['queries']:
+            yield name, f'запросов {base["queries"]} → {result["queries"]}'
+        if (result[metric] > base[metric] * (1 + threshold)
+                and result[metric] - base[metric] > min_delta_ms):
+            yield name, (
+                f'{metric} {base[metric]:.2f} → {result[metric]:.2f} ms'
+            )
+        if result['bytes'] > base['bytes'] * (1 + threshold):
+            yield name, f'байт {base["bytes"]} → {result["bytes"]}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет все адреса блога, статических страниц и авторизации '
+        'для анонима и вошедшего пользователя: задержку (p50/p95/p99), '
+        'число запросов к БД и размер ответа. Результаты сравниваются '
+        'с сохранённым в JSON базовым замером; при регрессии команда '
+        'завершается ошибкой. Данные создаются во временной транзакции '
+        'и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help='Запросы идут через ASGI-приложение вместо WSGI.',
+        )
+        parser.add_argument(
+            '--routes', nargs='+', metavar='NAME',
+            help='Замерять только эти адреса (например, blog:index).',
+        )
+        parser.add_argument(
+            '--baseline', type=Path,
+            help='JSON-файл базового замера.',
+        )
+        parser.add_argument(
+            '--save', action='store_true',
+            help='Записать результаты в --baseline вместо сравнения.',
+        )
+        parser.add_argument(
+            '--metric', choices=METRICS, default='p95_ms',
+            help='Показатель задержки для сравнения с базовым замером.',
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Допустимый относительный рост задержки и размера ответа.',
+        )
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=1.0,
+            help='Рост задержки меньше этого значения не считается '
+            'регрессией: так шум не роняет замеры быстрых страниц.',
+        )
+
+    def handle(self, *args, **options):
+        if options['save'] and not options['baseline']:
+            raise CommandError('Для --save нужен --baseline.')
+        with rolled_back():
+            paths = route_paths(*self.seed(options))
+            missing = set(route_names()) - set(paths)
+            if missing:
+                raise CommandError(
+                    'Нет замера для адресов: ' + ', '.join(sorted(missing))
+                )
+            if options['routes']:
+                unknown = set(options['routes']) - set(paths)
+                if unknown:
+                    raise CommandError(
+                        'Неизвестные адреса: ' + ', '.join(sorted(unknown))
+                    )
+                paths = {name: paths[name] for name in options['routes']}
+            allowed_hosts = settings.ALLOWED_HOSTS
+            if options['asgi']:
+                allowed_hosts = [*allowed_hosts, ASGI_BENCH_HOST]
+            with override_settings(ALLOWED_HOSTS=allowed_hosts):
+                results = self.run(paths, options)
+
+        report = {
+            'options': {
+                name: options[name]
+                for name in ('posts', 'comments', 'repeat', 'asgi')
+            },
+            'routes': results,
+        }
+        if options['save']:
+            options['baseline'].parent.mkdir(parents=True, exist_ok=True)
+            options['baseline'].write_text(
+                json.dumps(report, ensure_ascii=False, indent=2) + '\n',
+                encoding='utf-8',
+            )
+            self.stdout.write(f'Базовый замер сохранён: {options["baseline"]}')
+        elif options['baseline'] and options['baseline'].exists():
+            self.compare(report, options)
+
+    def seed(self, options):
+        author = User.objects.create(username='bench_author')
+        reader = User.objects.create(username='bench_reader')
+        category = Category.objects.create(
+            title='Бенчмарк', description='Бенчмарк', slug='bench'
+        )
+        location = Location.objects.create(name='Бенчмарк')
+        now = timezone.now()
+        create_posts(
+            options['posts'], 'Бенчмарк. Текст публикации. ' * 20,
+            author=author, category=category, location=location,
+        )
+        post = Post.objects.create(
+            title='Публикация с комментариями',
+            text='Бенчмарк. Текст публикации.',
+            pub_date=now,
+            author=author,
+            category=category,
+            location=location,
+        )
+        comments = [
+            Comment.objects.create(
+                post=post, author=author, text=f'Комментарий {i}'
+            )
+            for i in range(max(options['comments'], 1))
+        ]
+        return author, reader, category, post, comments[-1]
+
+    def run(self, paths, options):
+        author = User.objects.get(username='bench_author')
+        clients = {
+            'аноним': bench_client(asgi=options['asgi']),
+            'пользователь': bench_client(author, asgi=options['asgi']),
+        }
+        results = {}
+        for name, path in paths.items():
+            for who, client in clients.items():
+                if name in ANONYMOUS_ONLY and who != 'аноним':
+                    continue
+                # Первый запрос прогревает кеши и шаблоны.
+                measure_get(client, path, 1)
+                result = measure_get(client, path, options['repeat'])
+                key = f'{name} [{who}]'
+                results[key] = result
+                self.stdout.write(
+                    format_result(key, result)
+                    + f'  {result["bytes"]:>8} байт  {result["status"]}'
+                )
+        return results
+
+    def compare(self, report, options):
+        baseline = json.loads(
+            options['baseline'].read_text(encoding='utf-8')
+        )
+        if baseline['options'] != report['options']:
+            self.stderr.write(
+                'Параметры запуска отличаются от базового замера: '
+                f'{baseline["options"]}'
+            )
+        found = list(regressions(
+            report['routes'], baseline['routes'], options['metric'],
+            options['threshold'], options['min_delta_ms'],
+        ))
+        for name, message in found:
+            self.stderr.write(f'{name}: {message}')
+        if found:
+            raise CommandError(
+                f'Регрессий относительно {options["baseline"]}: {len(found)}'
+            )
+        self.stdout.write('Регрессий относительно базового замера нет.')
@@ -0,0 +1,73 @@
+import random
+
+from django.core.management.base import BaseCommand
+
+from blog.benchmarks import (
+    bench_client, create_posts, format_result, measure, rolled_back
+)
+from blog.datasets import vocabulary
+from blog.models import Category, User
+from blog.search import search_ids
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время поиска по синтетическому корпусу публикаций '
+        'с распределением слов по закону Ципфа. Данные создаются во '
+        'временной транзакции и откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--words', type=int, default=20_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        words = vocabulary(rng, options['words'])
+        weights = [1 / rank for rank in range(1, len(words) + 1)]
+
+        def sentence(length):
+            return ' '.join(rng.choices(words, weights, k=length))
+
+        with rolled_back():
+            author = User.objects.create(username='bench_author')
+            category = Category.objects.create(
+                title='Бенчмарк', description='Бенчмарк', slug='bench'
+            )
+            self.stdout.write(f'Создаём {options["posts"]} публикаций...')
+            create_posts(
+                options['posts'],
+                text=lambda i: sentence(rng.randint(30, 80)),
+                title=lambda i: sentence(rng.randint(3, 6)),
+                batch_size=5000,
+                author=author,
+                category=category,
+            )
+
+            queries = {
+                'частое слово': words[0],
+                'среднее слово': words[len(words) // 20],
+                'редкое слово': words[-1],
+                'два слова': f'{words[1]} {words[50]}',
+                'префикс': words[0][:3],
+            }
+            client = bench_client(author)
+            for name, query in queries.items():
+                ranked = search_ids(query)
+                result = measure(
+                    lambda: client.get('/search/', {'q': query}),
+                    options['repeat'],
+                )
+                self.stdout.write(format_result(f'{name} ({query})', result))
+                if len(ranked) < 10:
+                    continue
+                pk, rank = ranked[-1]
+                result = measure(
+                    lambda: search_ids(query, (rank, pk)),
+                    options['repeat'],
+                )
+                self.stdout.write(
+                    format_result('  следующая страница', result)
+                )
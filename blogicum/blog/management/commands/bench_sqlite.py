@@ -0,0 +1,147 @@
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+
+from blog.benchmarks import bench_client, create_posts, percentile
+from blog.models import Category, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает ленту читателями и комментарии пишущими потоками на '
+        'временной копии базы и сравнивает настройки SQLite по умолчанию '
+        'с текущими (SQLITE_PRAGMAS и CONN_MAX_AGE). Для профиля '
+        'продакшена запускайте с --settings=blogicum.settings_production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--posts', type=int, default=200)
+
+    def handle(self, *args, **options):
+        profiles = {
+            'SQLite по умолчанию': ({'journal_mode': 'DELETE'}, 0),
+            'текущие настройки': (
+                settings.SQLITE_PRAGMAS,
+                settings.DATABASES['default'].get('CONN_MAX_AGE', 0),
+            ),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for number, (name, profile) in enumerate(profiles.items()):
+                path = Path(directory) / f'bench_{number}.sqlite3'
+                result = self.run_profile(path, *profile, options)
+                self.report(name, result)
+
+    def run_profile(self, path, pragmas, max_age, options):
+        database = settings.DATABASES['default']
+        old_name, old_max_age = database['NAME'], database['CONN_MAX_AGE']
+        old_test = database['TEST']
+        database['TEST'] = {**old_test, 'NAME': str(path)}
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            database['CONN_MAX_AGE'] = max_age
+            try:
+                post_ids, readers, writers = self.seed(options)
+                connection.close()
+                return self.load(post_ids, readers, writers, options)
+            finally:
+                database['CONN_MAX_AGE'] = old_max_age
+                connections.close_all()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                database['TEST'] = old_test
+
+    def seed(self, options):
+        author = User.objects.create(username='bench_author')
+        category = Category.objects.create(
+            title='Бенчмарк', description='Бенчмарк', slug='bench'
+        )
+        create_posts(
+            options['posts'], 'Текст публикации. ' * 50,
+            author=author, category=category,
+        )
+        readers = [
+            bench_client(author) for _ in range(options['readers'])
+        ]
+        writers = [
+            bench_client(
+                User.objects.create(username=f'bench_writer_{i}')
+            )
+            for i in range(options['writers'])
+        ]
+        post_ids = list(Post.objects.values_list('id', flat=True))
+        return post_ids, readers, writers
+
+    def load(self, post_ids, readers, writers, options):
+        rng = random.Random(1)
+        reads, writes, errors = [], [], []
+
+        def read(client):
+            client.get('/')
+
+        def write(client):
+            post_id = rng.choice(post_ids)
+            client.post(
+                f'/posts/{post_id}/comment/', {'text': 'Комментарий'}
+            )
+
+        def worker(client, request, timings):
+            try:
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        request(client)
+                    except OperationalError:
+                        # «database is locked»: блокировку не дождались.
+                        errors.append(request.__name__)
+                        continue
+                    timings.append((time.perf_counter() - start) * 1000)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=(client, read, reads))
+            for client in readers
+        ] + [
+            threading.Thread(target=worker, args=(client, write, writes))
+            for client in writers
+        ]
+        deadline = time.perf_counter() + options['seconds']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {
+            'reads': reads,
+            'writes': writes,
+            'errors': len(errors),
+            'seconds': options['seconds'],
+        }
+
+    def report(self, name, result):
+        self.stdout.write(name)
+        for kind, timings in (
+            ('чтение ленты', result['reads']),
+            ('комментарий', result['writes']),
+        ):
+            if not timings:
+                self.stdout.write(f'  {kind:<14} нет успешных запросов')
+                continue
+            rate = len(timings) / result['seconds']
+            self.stdout.write(
+                f'  {kind:<14} {rate:7.0f} запр./с  '
+                f'p50 {percentile(timings, 50):8.2f} ms  '
+                f'p95 {percentile(timings, 95):8.2f} ms  '
+                f'p99 {percentile(timings, 99):8.2f} ms'
+            )
+        self.stdout.write(f'  ошибок блокировки: {result["errors"]}')
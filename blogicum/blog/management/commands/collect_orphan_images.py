@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from blog.maintenance import collect_orphan_images
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет картинки публикаций и их уменьшенные копии, на которые '
+        'не ссылается ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать файлы, которые будут удалены.',
+        )
+
+    def handle(self, *args, **options):
+        removed = collect_orphan_images(options['dry_run'])
+        for name in removed:
+            self.stdout.write(name)
+        self.stdout.write(f'Удалено файлов: {len(removed)}')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog.maintenance import fill_excerpts
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет анонсы публикаций для карточек в лентах. По умолчанию '
+        'обрабатываются только публикации без анонса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать анонсы у всех публикаций.',
+        )
+
+    def handle(self, *args, **options):
+        filled = fill_excerpts(
+            batch_size=options['batch_size'],
+            only_missing=not options['all'],
+        )
+        self.stdout.write(f'Заполнено анонсов: {filled}')
@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.caches import PAGES_VERSION, POSTS_VERSION, bump_version
+from blog.datasets import MODELS, chunks, generate_chunk, insert_sql
+from blog.loading import FixtureLoader
+from blog.maintenance import recount_comments
+
+# Пароль всех созданных пользователей.
+PASSWORD = 'password'
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт воспроизводимый синтетический набор данных: места, '
+        'категории, пользователей, публикации и комментарии с перекосом '
+        'как в жизни (популярные авторы и публикации, отложенные '
+        'публикации, снятые категории). Строки готовятся в нескольких '
+        'процессах и вставляются пачками в одной транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=500)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--users', type=int, default=50_000)
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--comments', type=int, default=3_000_000)
+        parser.add_argument(
+            '--scheduled', type=float, default=0.02,
+            help='Доля отложенных публикаций.',
+        )
+        parser.add_argument(
+            '--unpublished', type=float, default=0.03,
+            help='Доля снятых с публикации публикаций.',
+        )
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--now', type=datetime.fromisoformat, default=None,
+            help='Момент, относительно которого строятся даты '
+            '(ISO 8601); по умолчанию — текущее время.',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count(),
+            help='Количество процессов, готовящих строки.',
+        )
+
+    def handle(self, *args, **options):
+        if options['posts'] and not (options['users']
+                                     and options['categories']):
+            raise CommandError('Для публикаций нужны авторы и категории.')
+        if options['comments'] and not (options['posts']
+                                        and options['users']):
+            raise CommandError('Для комментариев нужны публикации и авторы.')
+        if not 0 <= options['scheduled'] < 1:
+            raise CommandError('--scheduled должен быть в [0, 1).')
+
+        now = options['now'] or timezone.now()
+        if timezone.is_naive(now):
+            now = timezone.make_aware(now)
+        plan = {
+            kind: options[kind] for kind in MODELS
+        } | {
+            'seed': options['seed'],
+            'prefix': f'gen{options["seed"]}',
+            'now': now,
+            'scheduled': options['scheduled'],
+            'unpublished': options['unpublished'],
+            'password': make_password(PASSWORD),
+            'first_ids': {
+                kind: (model.objects.aggregate(Max('id'))['id__max'] or 0)
+                + 1
+                for kind, model in MODELS.items()
+            },
+        }
+
+        start = time.perf_counter()
+        counts = Counter()
+        loader = FixtureLoader()
+        with transaction.atomic():
+            for kind, rows in self.generate(plan, options['processes']):
+                model = MODELS[kind]
+                if kind not in counts:
+                    loader.defer_indexes(model)
+                with connection.cursor() as cursor:
+                    cursor.executemany(insert_sql(model), rows)
+                counts[kind] += len(rows)
+            loader.restore_indexes()
+            models = [MODELS[kind] for kind in counts]
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(
+                    no_style(), models
+                ):
+                    cursor.execute(sql)
+        inserted = time.perf_counter() - start
+        recount_comments()
+        bump_version(POSTS_VERSION, PAGES_VERSION)
+
+        for kind in MODELS:
+            self.stdout.write(f'{kind:<12} {counts[kind]:>10}')
+        total = sum(counts.values())
+        self.stdout.write(
+            f'Создано строк: {total} за {inserted:.2f} с '
+            f'({total / max(inserted, 1e-9):.0f} строк/с), '
+            f'счётчики комментариев: '
+            f'{time.perf_counter() - start - inserted:.2f} с. '
+            f'Пароль пользователей: {PASSWORD}'
+        )
+
+    def generate(self, plan, processes):
+        if processes <= 1:
+            for chunk in chunks(plan):
+                yield generate_chunk(plan, *chunk)
+            return
+        # Процессы запускаются с нуля, а не копией родителя: родитель в
+        # это время держит открытую транзакцию, а дочерним процессам
+        # соединение с базой не нужно.
+        # Пачки вставляются по порядку, а готовится не больше двух пачек
+        # на процесс вперёд, чтобы не держать в памяти весь набор.
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        ) as executor:
+            pending = deque()
+            for chunk in chunks(plan):
+                pending.append(
+                    executor.submit(generate_chunk, plan, *chunk)
+                )
+                if len(pending) >= processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.maintenance import (
+    build_thumbnails, images_without_thumbnails, mark_thumbnails
+)
+
+MARK_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии и WebP-варианты картинок публикаций, '
+        'загруженных до появления миниатюр.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count(),
+            help='Количество процессов для обработки картинок.',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии и у уже обработанных картинок.',
+        )
+
+    def handle(self, *args, **options):
+        names = images_without_thumbnails(options['force'])
+        # Дочерним процессам соединения с БД не нужны,
+        # а унаследованные от родителя использовать нельзя.
+        connections.close_all()
+
+        force = options['force']
+        done, failed = [], 0
+        with ProcessPoolExecutor(
+            max_workers=options['processes'], initializer=django.setup
+        ) as executor:
+            futures = {
+                executor.submit(build_thumbnails, name, force): name
+                for name in names
+            }
+            for future in as_completed(futures):
+                try:
+                    done.append(future.result())
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f'{futures[future]}: {error}')
+                if len(done) >= MARK_BATCH_SIZE:
+                    mark_thumbnails(done)
+                    done = []
+        mark_thumbnails(done)
+
+        self.stdout.write(
+            f'Обработано картинок: {len(names) - failed}, ошибок: {failed}'
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.maintenance import publish_scheduled, refresh_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        'Открывает в лентах отложенные публикации, время которых наступило. '
+        'Запускается по расписанию (cron) или постоянно с флагом --loop.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Проверять отложенные публикации в цикле.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=60,
+            help='Пауза между проверками в секундах.',
+        )
+        parser.add_argument(
+            '--refresh', action='store_true',
+            help='Пересчитать видимость всех публикаций.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['refresh']:
+            changed = refresh_visibility(options['batch_size'])
+            self.stdout.write(f'Изменена видимость публикаций: {changed}')
+            return
+
+        while True:
+            post_ids = publish_scheduled(options['batch_size'])
+            if post_ids or not options['loop']:
+                self.stdout.write(f'Опубликовано: {len(post_ids)}')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
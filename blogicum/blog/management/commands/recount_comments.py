@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.maintenance import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        repaired = recount_comments(options['batch_size'])
+        self.stdout.write(f'Исправлено счётчиков: {repaired}')
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из очереди: уменьшение картинок, '
+        'отправку писем и сброс кеша карточек. Запускается по расписанию '
+        '(cron) или постоянно с флагом --loop.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Ждать новые задачи, а не завершаться на пустой очереди.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Пауза между проверками пустой очереди в секундах.',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Выполнить не больше указанного числа задач.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending(options['limit'])
+            if processed or not options['loop']:
+                self.stdout.write(f'Выполнено задач: {processed}')
+            if not options['loop']:
+                return
+            if not processed:
+                time.sleep(options['interval'])
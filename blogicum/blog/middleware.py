@@ -0,0 +1,125 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from blog.routers import use_replica, wrote
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PIN_COOKIE = 'primary'
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_stats():
+    with _stats_lock:
+        return {view: dict(stats) for view, stats in _stats.items()}
+
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+
+class QueryBudgetMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        response['Server-Timing'] = (
+            f'db;dur={recorder.duration * 1000:.2f};'
+            f'desc="{recorder.count} queries, '
+            f'{recorder.duplicates} duplicates"'
+        )
+
+        match = request.resolver_match
+        if match is None:
+            return response
+        view_name = match.view_name
+        with _stats_lock:
+            stats = _stats[view_name]
+            stats['requests'] += 1
+            stats['queries'] += recorder.count
+            stats['duplicates'] += recorder.duplicates
+            stats['time_ms'] += recorder.duration * 1000
+            stats['max_queries'] = max(stats['max_queries'], recorder.count)
+
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None and recorder.count > budget:
+            message = (
+                f'{view_name}: {recorder.count} запросов к БД '
+                f'при бюджете {budget} '
+                f'(повторяющихся: {recorder.duplicates}).'
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+class ReplicaPinningMiddleware:
+    # Реплики отстают от основной базы, поэтому после записи пользователь
+    # REPLICA_PIN_SECONDS секунд читает из основной и видит свои изменения.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replica = None
+        if (settings.DATABASE_REPLICAS
+                and request.method in ('GET', 'HEAD')
+                and REPLICA_PIN_COOKIE not in request.COOKIES):
+            replica = random.choice(settings.DATABASE_REPLICAS)
+        use_replica(replica)
+        try:
+            response = self.get_response(request)
+            if wrote():
+                response.set_cookie(
+                    REPLICA_PIN_COOKIE,
+                    '1',
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                    samesite='Lax',
+                )
+        finally:
+            use_replica(None)
+        return response
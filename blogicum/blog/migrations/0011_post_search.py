@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:33
+
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from blog.search import install_search
+    install_search(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from blog.search import uninstall_search
+    uninstall_search(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:51
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    last_id = 0
+    while True:
+        rows = list(
+            Post.objects.filter(pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', 'text')[:1000]
+        )
+        if not rows:
+            return
+        Post.objects.bulk_update(
+            [
+                Post(pk=pk, excerpt=Truncator(text).words(10, truncate=' …'))
+                for pk, text in rows
+            ],
+            ['excerpt'],
+        )
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Первые слова текста для карточки в лентах.', verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,23 @@
 from django.db import models
+from django.utils import timezone
+from django.utils.text import Truncator
 from blog.abstracts import BaseModel, BaseTitleModel
+from blog.images import THUMBNAIL_WIDTHS, srcset, thumbnail_name
+from blog.storage import ContentAddressedStorage
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+EXCERPT_WORDS = 10
+
+# Поля публикации, которые Post.save() вычисляет сам.
+DERIVED_FIELDS = ('updated_at', 'excerpt', 'is_visible')
+
+
+def make_excerpt(text):
+    # То же, что фильтр truncatewords в карточке публикации.
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
 
 class Location(BaseModel):
 
@@ -64,12 +78,118 @@ class Post(BaseTitleModel):
         related_name='category',
         verbose_name='Категория',
     )
-    image = models.ImageField('Foto', upload_to='post_images/', blank=True)
+    image = models.ImageField(
+        'Foto',
+        upload_to='post_images/',
+        storage=ContentAddressedStorage(),
+        blank=True,
+    )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        default=timezone.now,
+        editable=False,
+    )
+    is_visible = models.BooleanField(
+        'Видна в лентах',
+        default=False,
+        editable=False,
+        help_text='Публикация опубликована, её категория опубликована '
+        'и время публикации наступило.'
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+    excerpt = models.TextField(
+        'Анонс',
+        blank=True,
+        editable=False,
+        help_text='Первые слова текста для карточки в лентах.'
+    )
+    thumbnails_image = models.CharField(
+        'Картинка, для которой готовы уменьшенные копии',
+        max_length=100,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = ('публикация')
         verbose_name_plural = ('Публикации')
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_visible=False, is_published=True),
+                name='post_scheduled_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('image',),
+                name='post_image_idx',
+            ),
+        )
+
+    @property
+    def has_thumbnails(self):
+        return bool(self.image) and self.thumbnails_image == self.image.name
+
+    def image_variant_url(self, width, extension='jpg'):
+        return self.image.storage.url(
+            thumbnail_name(self.image.name, width, extension)
+        )
+
+    @property
+    def thumbnail_url(self):
+        return self.image_variant_url(THUMBNAIL_WIDTHS[1])
+
+    @property
+    def image_srcset(self):
+        return srcset(self.image.storage, self.image.name, 'jpg')
+
+    @property
+    def image_webp_srcset(self):
+        return srcset(self.image.storage, self.image.name, 'webp')
+
+    def save(self, *args, **kwargs):
+        self.updated_at = timezone.now()
+        self.excerpt = make_excerpt(self.text)
+        self.is_visible = (
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields:
+            # Производные поля пересчитаны выше и должны попасть в UPDATE
+            # вместе с полями, которые передал вызывающий код.
+            kwargs['update_fields'] = {*update_fields, *DERIVED_FIELDS}
+        elif update_fields is None and self.pk and not self._state.adding:
+            # Счётчик комментариев меняется только атомарным UPDATE,
+            # поэтому не перезаписываем его устаревшим значением.
+            # Из-за update_fields сохранение уже удалённой публикации
+            # не вставляет её заново, а падает с DatabaseError
+            # «Save with update_fields did not affect any rows.».
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
 
 
 class Comment(BaseModel):
@@ -84,3 +204,46 @@ class Comment(BaseModel):
     class Meta:
         default_related_name = ('comments')
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=100)
+    payload = models.JSONField('Параметры', default=dict)
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUSES, default=QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    run_at = models.DateTimeField('Запустить после', default=timezone.now)
+    locked_at = models.DateTimeField('Взята в работу', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = ('фоновая задача')
+        verbose_name_plural = ('Фоновые задачи')
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('run_at', 'id'),
+                condition=models.Q(status='queued'),
+                name='job_queue_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
@@ -1,11 +1,177 @@
-from django.core.paginator import Paginator
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from blog.caches import posts_count
 
 
 NUMBER_POSTS_LIST = 10
 
+NUMBER_COMMENTS_LIST = 50
+
+
+class FeedPaginator(Paginator):
+
+    def __init__(self, object_list, per_page, feed):
+        super().__init__(object_list, per_page)
+        self.feed = feed
+
+    @cached_property
+    def count(self):
+        return posts_count(self.object_list, self.feed)
+
+    @cached_property
+    def open_ended(self):
+        # Публикаций больше POSTS_COUNT_LIMIT: точного числа страниц
+        # не знаем, и последней считается следующая за текущей.
+        limit = settings.POSTS_COUNT_LIMIT
+        return bool(limit) and self.count > limit
+
+    def validate_number(self, number):
+        if not self.open_ended:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        if not self.open_ended:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        # Одна лишняя публикация показывает, есть ли следующая страница.
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects:
+            raise EmptyPage('That page contains no results')
+        self.num_pages = number + (len(objects) > self.per_page)
+        return self._get_page(objects[:self.per_page], number, self)
+
 
-def number_posts_list(request, post_list):
-    paginator = Paginator(post_list, NUMBER_POSTS_LIST)
+def number_posts_list(request, post_list, feed):
+    paginator = FeedPaginator(post_list, NUMBER_POSTS_LIST, feed)
     page_number = request.GET.get('page')
     post_list = paginator.get_page(page_number)
+    post_list.elided_page_range = paginator.get_elided_page_range(
+        post_list.number
+    )
     return post_list
+
+
+def encode_cursor(value, pk):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    token = f'{value}|{pk}'
+    return urlsafe_b64encode(token.encode()).decode()
+
+
+# Наибольший ключ, который помещается в INTEGER базы.
+MAX_PK = 2 ** 63 - 1
+
+
+def decode_cursor(token, parse=datetime.fromisoformat):
+    try:
+        value, pk = urlsafe_b64decode(token.encode()).decode().split('|')
+        value, pk = parse(value), int(pk)
+    except (ValueError, UnicodeError, binascii.Error):
+        return None
+    if not 0 < pk <= MAX_PK:
+        return None
+    return value, pk
+
+
+class CursorPage:
+    cursor_mode = True
+
+    def __init__(self, object_list, has_next, has_previous,
+                 date_field='pub_date'):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.date_field = date_field
+
+    def _cursor(self, item):
+        return encode_cursor(getattr(item, self.date_field), item.id)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_cursor(self):
+        return self._cursor(self.object_list[-1])
+
+    def previous_cursor(self):
+        return self._cursor(self.object_list[0])
+
+
+def cursor_posts_list(request, post_list):
+    after = decode_cursor(request.GET.get('after', ''))
+    before = decode_cursor(request.GET.get('before', ''))
+
+    if before:
+        pub_date, pk = before
+        posts = list(post_list.filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+        ).order_by('pub_date', 'id')[:NUMBER_POSTS_LIST + 1])
+        if posts:
+            has_previous = len(posts) > NUMBER_POSTS_LIST
+            posts = posts[:NUMBER_POSTS_LIST][::-1]
+            return CursorPage(posts, True, has_previous)
+        after = None
+
+    if after:
+        pub_date, pk = after
+        post_list = post_list.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+        )
+
+    posts = list(post_list[:NUMBER_POSTS_LIST + 1])
+    has_next = len(posts) > NUMBER_POSTS_LIST
+    return CursorPage(posts[:NUMBER_POSTS_LIST], has_next, bool(after))
+
+
+def paginate_posts(request, post_list, feed):
+    if settings.POSTS_PAGINATION == 'cursor':
+        return cursor_posts_list(request, post_list)
+    return number_posts_list(request, post_list, feed)
+
+
+def comments_list(request, comments):
+    before = decode_cursor(request.GET.get('comments_before', ''))
+    if before:
+        created_at, pk = before
+        comments = comments.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    comments = list(
+        comments.order_by('-created_at', '-id')[:NUMBER_COMMENTS_LIST + 1]
+    )
+    has_previous = len(comments) > NUMBER_COMMENTS_LIST
+    return CursorPage(
+        comments[:NUMBER_COMMENTS_LIST][::-1],
+        False,
+        has_previous,
+        date_field='created_at',
+    )
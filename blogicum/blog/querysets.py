@@ -1,41 +1,62 @@
-from django.utils import timezone
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 
 from blog.models import Post, Comment
 
 
-def filter_posts(posts):
-    return posts.filter(
+def visible(now):
+    return Q(
         is_published=True,
         category__is_published=True,
-        pub_date__lte=timezone.now(),
+        pub_date__lte=now,
+    )
+
+
+def comment_total():
+    # Число комментариев публикации, посчитанное по таблице комментариев.
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        0,
     )
 
 
+def filter_posts(posts):
+    return posts.filter(is_visible=True)
+
+
 def posts():
     return Post.objects.select_related(
         'location',
         'author',
-    ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+        'category',
+    ).order_by('-pub_date', '-id')
+
+
+def feed_posts():
+    # Карточкам в лентах хватает анонса, полный текст из базы не читаем.
+    return posts().defer('text')
 
 
 def posts_filter_full(category_id=None):
-    POSTS = filter_posts(posts())
+    POSTS = filter_posts(feed_posts())
 
     if category_id:
         return POSTS.filter(category_id=category_id)
     return POSTS
 
 
-def posts_filter_author(author_id, user):
-    POSTS = posts().filter(author_id=author_id)
-    post = POSTS.first()
+def posts_filter_author(author, user):
+    POSTS = feed_posts().filter(author=author)
 
-    if post is not None:
-        author = post.author
-        if author == user:
-            return POSTS
+    if author == user:
+        return POSTS
 
     return filter_posts(POSTS)
 
@@ -46,14 +67,15 @@ def get_post(pk, author=None):
     return get_object_or_404(Post, pk=pk)
 
 
-def get_post_filter_author(pk, user):
-    post = get_post(pk)
-    author = post.author
-    posts_filter = filter_posts(Post.objects)
-    if user == author:
-        return post
+def visible_to(user):
+    visibility = Q(is_visible=True)
+    if user.is_authenticated:
+        visibility |= Q(author=user)
+    return visibility
+
 
-    return get_object_or_404(posts_filter, pk=pk)
+def get_post_filter_author(pk, user):
+    return get_object_or_404(posts().filter(visible_to(user)), pk=pk)
 
 
 def comment(id, post_id, user):
@@ -0,0 +1,74 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+# Сессии читаются при каждом запросе и должны быть видны сразу после входа.
+PRIMARY_APPS = {'sessions'}
+
+_state = threading.local()
+
+
+def use_replica(alias):
+    # Одна реплика на весь запрос: разные реплики отстают по-разному,
+    # и список со счётчиком из двух реплик могли бы не совпасть.
+    _state.replica = alias
+    _state.wrote = False
+    _state.read_replica = False
+
+
+def wrote():
+    return getattr(_state, 'wrote', False)
+
+
+def read_replica():
+    # Данные из отстающей реплики нельзя класть в общий кеш: запись уже
+    # сменила версию, и устаревший ответ жил бы под новым ключом.
+    return getattr(_state, 'read_replica', False)
+
+
+@contextmanager
+def primary_reads():
+    # Промахи общих кешей редки, их заполняем из основной базы.
+    replica = getattr(_state, 'replica', None)
+    _state.replica = None
+    try:
+        yield
+    finally:
+        _state.replica = replica
+
+
+def from_replica(hints):
+    instance = hints.get('instance')
+    return (
+        instance is not None
+        and instance._state.db in settings.DATABASE_REPLICAS
+    )
+
+
+class ReplicaRouter:
+    # Чтения идут в реплики только внутри запросов, которые отметил
+    # ReplicaPinningMiddleware; команды, задачи и миграции работают
+    # с основной базой.
+
+    def db_for_read(self, model, **hints):
+        replica = getattr(_state, 'replica', None)
+        if replica is None or model._meta.app_label in PRIMARY_APPS:
+            # Связанные объекты прочитанного из реплики объекта после
+            # записи тоже читаем из основной базы.
+            return 'default' if from_replica(hints) else None
+        _state.read_replica = True
+        return replica
+
+    def db_for_write(self, model, **hints):
+        # После записи остаток запроса читает из основной базы.
+        _state.replica = None
+        _state.wrote = True
+        # Объект, прочитанный из реплики, сохраняется в основную базу.
+        return 'default' if from_replica(hints) else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
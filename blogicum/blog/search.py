@@ -0,0 +1,136 @@
+import re
+
+from django.db import connection
+
+from blog.posts_list import NUMBER_POSTS_LIST, CursorPage, decode_cursor
+from blog.querysets import feed_posts
+
+SEARCH_TABLE = 'blog_post_search'
+
+# Совпадение в заголовке весит больше совпадения в тексте.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+SCHEMA = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, text, content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='3 4'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_insert
+    AFTER INSERT ON blog_post BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_delete
+    AFTER DELETE ON blog_post BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END""",
+)
+
+TRIGGERS = (
+    f'{SEARCH_TABLE}_insert',
+    f'{SEARCH_TABLE}_delete',
+    f'{SEARCH_TABLE}_update',
+)
+
+SEARCH_SQL = f"""
+    SELECT blog_post.id, bm25({SEARCH_TABLE}, %s, %s) AS search_rank
+    FROM {SEARCH_TABLE}
+    JOIN blog_post ON blog_post.id = {SEARCH_TABLE}.rowid
+    WHERE {SEARCH_TABLE} MATCH %s AND blog_post.is_visible
+      {{after}}
+    ORDER BY search_rank, blog_post.id
+    LIMIT %s
+"""
+
+AFTER_SQL = (
+    f'AND (bm25({SEARCH_TABLE}, %s, %s) > %s '
+    f'OR (bm25({SEARCH_TABLE}, %s, %s) = %s AND blog_post.id > %s))'
+)
+
+
+def search_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def install_search(using=connection):
+    if (not search_available(using)
+            or 'blog_post' not in using.introspection.table_names()):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master "
+            "WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            TRIGGERS,
+        )
+        complete = cursor.fetchone()[0] == len(TRIGGERS)
+        for statement in SCHEMA:
+            cursor.execute(statement)
+        if not complete:
+            # Триггеры пропадают, когда миграция пересоздаёт blog_post;
+            # изменения, сделанные без них, подтягиваем перестройкой.
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+                "VALUES ('rebuild')"
+            )
+
+
+def uninstall_search(using=connection):
+    if not search_available(using):
+        return
+    with using.cursor() as cursor:
+        for trigger in TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def match_expression(query):
+    # Слова запроса ищем по префиксу, чтобы «кот» находил «котов»;
+    # короткие префиксы ускоряет индекс prefix='3 4'. Кавычки не дают
+    # пользователю писать операторы FTS5.
+    terms = re.findall(r'\w+', query.lower())
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_ids(query, after=None, limit=NUMBER_POSTS_LIST):
+    match = match_expression(query)
+    if not match:
+        return []
+    weights = [TITLE_WEIGHT, TEXT_WEIGHT]
+    params = weights + [match]
+    after_sql = ''
+    if after:
+        rank, pk = after
+        after_sql = AFTER_SQL
+        params += weights + [rank] + weights + [rank, pk]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SEARCH_SQL.format(after=after_sql), params + [limit]
+        )
+        return cursor.fetchall()
+
+
+def search_posts(request, query):
+    after = decode_cursor(request.GET.get('after', ''), parse=float)
+    ranked = search_ids(query, after, NUMBER_POSTS_LIST + 1)
+    has_next = len(ranked) > NUMBER_POSTS_LIST
+    ranked = ranked[:NUMBER_POSTS_LIST]
+    found = feed_posts().in_bulk([pk for pk, _ in ranked])
+    post_list = []
+    for pk, rank in ranked:
+        post = found.get(pk)
+        if post is None:
+            continue
+        post.search_rank = rank
+        post_list.append(post)
+    return CursorPage(
+        post_list, has_next, bool(after), date_field='search_rank'
+    )
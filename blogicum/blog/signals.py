@@ -0,0 +1,168 @@
+from django.db.models import BooleanField, ExpressionWrapper, F, Q
+from django.db.models.functions import Greatest
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_save
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from blog.caches import PAGES_VERSION, POSTS_VERSION, bump_version
+from blog.jobs import enqueue
+from blog.models import (
+    Category, Comment, Location, Post, User, make_excerpt
+)
+from blog.querysets import comment_total, visible
+from blog.search import install_search
+
+AUTHOR_PAGE_FIELDS = {'username', 'first_name', 'last_name', 'is_staff'}
+
+# Отправляется, когда отложенные публикации появляются в лентах.
+posts_published = Signal()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(posts_published)
+def posts_changed(sender, **kwargs):
+    bump_version(POSTS_VERSION, PAGES_VERSION)
+
+
+@receiver(post_save, sender=Post)
+def post_loaded(sender, instance, raw, **kwargs):
+    # Фикстуры сохраняются в обход Post.save().
+    if raw:
+        posts = Post.objects.filter(pk=instance.pk)
+        posts.update(
+            is_visible=posts.filter(visible(timezone.now())).exists(),
+            excerpt=make_excerpt(instance.text),
+            comment_count=comment_total(),
+        )
+
+
+@receiver(pre_save, sender=Post)
+def post_image_replacing(sender, instance, raw, **kwargs):
+    instance._replaced_image = None
+    if raw or instance._state.adding:
+        return
+    image = Post.objects.filter(pk=instance.pk).values_list(
+        'image', flat=True
+    ).first()
+    if image and image != instance.image.name:
+        instance._replaced_image = image
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, raw, **kwargs):
+    if getattr(instance, '_replaced_image', None):
+        enqueue('delete_image', {'name': instance._replaced_image})
+    if raw or not instance.image or instance.has_thumbnails:
+        return
+    enqueue('make_thumbnails', {'name': instance.image.name})
+
+
+@receiver(post_delete, sender=Post)
+def post_image_deleted(sender, instance, **kwargs):
+    if instance.image:
+        enqueue('delete_image', {'name': instance.image.name})
+
+
+@receiver(post_migrate)
+def search_migrated(sender, using, **kwargs):
+    # Миграции, пересоздающие blog_post, удаляют триггеры поиска.
+    if sender.name == 'blog':
+        install_search(connections[using])
+
+
+@receiver(pre_save, sender=Category)
+def category_publishing(sender, instance, raw, **kwargs):
+    instance._was_published = None
+    if raw or instance._state.adding:
+        return
+    instance._was_published = Category.objects.filter(
+        pk=instance.pk
+    ).values_list('is_published', flat=True).first()
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    was_published = getattr(instance, '_was_published', None)
+    if was_published is None or was_published != instance.is_published:
+        is_visible = False
+        if instance.is_published:
+            is_visible = ExpressionWrapper(
+                Q(is_published=True, pub_date__lte=timezone.now()),
+                output_field=BooleanField(),
+            )
+        Post.objects.filter(category=instance).update(is_visible=is_visible)
+    # Карточки показывают название категории; обновление updated_at у
+    # всех её публикаций может быть долгим и уходит в очередь.
+    enqueue('touch_posts', {'category_id': instance.pk})
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    Post.objects.filter(category=None, is_visible=True).update(
+        is_visible=False, updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        # Страницы сбрасываем сразу, а обновление updated_at у всех
+        # публикаций места может быть долгим и уходит в очередь.
+        bump_version(PAGES_VERSION)
+        enqueue('touch_posts', {'location_id': instance.pk})
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, created, update_fields, **kwargs):
+    if created:
+        return
+    if update_fields is None or AUTHOR_PAGE_FIELDS & set(update_fields):
+        bump_version(PAGES_VERSION)
+        enqueue('touch_posts', {'author_id': instance.pk})
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        # Счётчик из фикстуры публикации не учитывает уже загруженные
+        # комментарии, поэтому считаем заново, а не прибавляем.
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=comment_total()
+        )
+        bump_version(PAGES_VERSION)
+        return
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+    bump_version(PAGES_VERSION)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id).update(
+        # Разошедшийся счётчик не должен ломать удаление комментария
+        # из-за ограничения comment_count >= 0.
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        updated_at=timezone.now(),
+    )
+    bump_version(PAGES_VERSION)
+
+
+@receiver(connection_created)
+def sqlite_connected(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
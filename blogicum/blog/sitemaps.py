@@ -0,0 +1,198 @@
+import time
+from functools import lru_cache
+from hashlib import md5
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, IntegerField, Max, Q
+from django.db.models.functions import Cast
+from django.urls import reverse
+from django.utils.html import escape
+
+from blog.caches import POSTS_VERSION, get_version
+from blog.models import Category, Post, User
+from blog.routers import primary_reads, read_replica
+
+# Ограничение протокола sitemaps.org на число адресов в одном файле.
+SITEMAP_LIMIT = 50_000
+
+ITERATOR_CHUNK_SIZE = 2000
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+URL_SENTINEL = 918273645
+
+
+@lru_cache(maxsize=None)
+def url_pattern(name):
+    # reverse() для каждой из 50 000 строк шарда занимает большую часть
+    # времени, поэтому шаблон адреса строим один раз.
+    url = reverse(name, args=(URL_SENTINEL,))
+    return url.replace(str(URL_SENTINEL), '{}')
+
+
+def location(name, value):
+    # Экранирование то же, что у reverse().
+    return url_pattern(name).format(quote(str(value), safe="!$&'()*+,;=~:@"))
+
+
+class SitemapSection:
+
+    def __init__(self, base, rows, location):
+        self.base = base
+        self.rows = rows
+        self.location = location
+
+    def shards(self):
+        # Шард — диапазон из SITEMAP_LIMIT идентификаторов, поэтому
+        # в файле не может оказаться больше SITEMAP_LIMIT адресов.
+        shard = Cast((F('id') - 1) / SITEMAP_LIMIT, IntegerField())
+        return self.base().order_by().annotate(shard=shard).values_list(
+            'shard', flat=True
+        ).distinct().order_by('shard')
+
+    def has_shard(self, shard):
+        return self.base().filter(
+            id__gt=shard * SITEMAP_LIMIT,
+            id__lte=(shard + 1) * SITEMAP_LIMIT,
+        ).exists()
+
+    def urls(self, shard):
+        rows = self.rows(self.base()).filter(
+            id__gt=shard * SITEMAP_LIMIT,
+            id__lte=(shard + 1) * SITEMAP_LIMIT,
+        ).order_by('id')
+        for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            yield self.location(row), row['updated_at']
+
+
+SECTIONS = {
+    'posts': SitemapSection(
+        lambda: Post.objects.filter(is_visible=True),
+        lambda posts: posts.values('id', 'updated_at'),
+        lambda row: location('blog:post_detail', row['id']),
+    ),
+    'categories': SitemapSection(
+        lambda: Category.objects.filter(is_published=True),
+        lambda categories: categories.values('id', 'slug').annotate(
+            updated_at=Max(
+                'category__updated_at', filter=Q(category__is_visible=True)
+            )
+        ),
+        lambda row: location('blog:category_posts', row['slug']),
+    ),
+    'profiles': SitemapSection(
+        lambda: User.objects.filter(author__is_visible=True),
+        lambda users: users.values('id', 'username').annotate(
+            updated_at=Max('author__updated_at')
+        ),
+        lambda row: location('blog:profile', row['username']),
+    ),
+}
+
+
+def site_url(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def sitemap_key(base_url, *parts):
+    host = md5(base_url.encode()).hexdigest()
+    parts = ':'.join(map(str, parts))
+    return f'sitemap:{get_version(POSTS_VERSION)}:{host}:{parts}'
+
+
+def sitemap_generation(key):
+    # Поколение живёт столько же, сколько закешированный файл, и входит
+    # в ETag: lastmod и адреса профилей меняются без POSTS_VERSION,
+    # и после истечения кеша клиент должен получить новый файл, а не 304.
+    generation_key = f'{key}:generation'
+    generation = cache.get(generation_key)
+    if generation is None:
+        cache.add(
+            generation_key, time.time_ns(), settings.SITEMAP_CACHE_TIMEOUT
+        )
+        generation = cache.get(generation_key, time.time_ns())
+    return generation
+
+
+def cached_content(key):
+    cached = cache.get(key)
+    if cached is not None and cached[0] == sitemap_generation(key):
+        return cached[1]
+    return None
+
+
+def cache_content(key, content):
+    if read_replica():
+        return
+    cache.set(
+        key,
+        (sitemap_generation(key), content),
+        settings.SITEMAP_CACHE_TIMEOUT,
+    )
+
+
+def index_xml(base_url):
+    key = sitemap_key(base_url, 'index')
+    content = cached_content(key)
+    if content is None:
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<sitemapindex xmlns="{XMLNS}">',
+        ]
+        with primary_reads():
+            shards = [
+                (name, shard)
+                for name, section in SECTIONS.items()
+                for shard in section.shards()
+            ]
+        for name, shard in shards:
+            location = reverse(
+                'blog:sitemap_section', args=(name, shard)
+            )
+            lines.append(
+                f'<sitemap><loc>{escape(base_url + location)}</loc>'
+                '</sitemap>'
+            )
+        lines.append('</sitemapindex>')
+        content = '\n'.join(lines) + '\n'
+        cache_content(key, content)
+    return content
+
+
+def section_xml(base_url, name, shard):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    lines = []
+    for location, lastmod in SECTIONS[name].urls(shard):
+        url = f'<url><loc>{escape(base_url + location)}</loc>'
+        if lastmod is not None:
+            lastmod = lastmod.isoformat(timespec='seconds')
+            url += f'<lastmod>{lastmod}</lastmod>'
+        lines.append(url + '</url>\n')
+        if len(lines) == ITERATOR_CHUNK_SIZE:
+            yield ''.join(lines)
+            lines = []
+    yield ''.join(lines) + '</urlset>\n'
+
+
+def cached_section_xml(base_url, name, shard):
+    # Шард отдаётся потоком и целиком попадает в кеш, только когда
+    # выдача дошла до конца; памяти нужно не больше одного шарда.
+    # None — такого шарда нет.
+    key = sitemap_key(base_url, name, shard)
+    content = cached_content(key)
+    if content is not None:
+        return [content]
+    if not SECTIONS[name].has_shard(shard):
+        return None
+    return caching_section_xml(key, base_url, name, shard)
+
+
+def caching_section_xml(key, base_url, name, shard):
+    chunks = []
+    for chunk in section_xml(base_url, name, shard):
+        chunks.append(chunk)
+        yield chunk
+    cache_content(key, ''.join(chunks))
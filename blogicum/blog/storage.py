@@ -0,0 +1,54 @@
+import hashlib
+import os
+import re
+from pathlib import PurePosixPath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+# Имя по хешу и имена копий, выведенные из него (blog.images).
+ADDRESSED_STEM = re.compile(r'^(?P<digest>[0-9a-f]{64})(_\d+w)?$')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    # Имя файла — хеш содержимого: одинаковые картинки хранятся один раз,
+    # а изменившееся содержимое всегда получает новый адрес, поэтому
+    # файлы можно отдавать с «вечным» кешированием.
+
+    def content_name(self, name, content):
+        sha = hashlib.sha256()
+        for chunk in content.chunks():
+            sha.update(chunk)
+        digest = sha.hexdigest()
+        path = PurePosixPath(name)
+        return str(
+            path.parent / digest[:2] / f'{digest}{path.suffix.lower()}'
+        )
+
+    def is_addressed(self, name):
+        path = PurePosixPath(name)
+        match = ADDRESSED_STEM.match(path.stem)
+        return bool(match) and path.parent.name == match['digest'][:2]
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        if not self.is_addressed(name):
+            name = self.content_name(name, content)
+        if self.exists(name):
+            # Свежая отметка времени защищает файл от сборщика мусора,
+            # пока новая публикация со ссылкой на него не сохранена.
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                # Сборщик удалил файл между exists() и utime():
+                # записываем его заново.
+                pass
+        saved = super().save(name, content, max_length)
+        if saved != name:
+            # Такой же файл успел записать параллельный запрос.
+            self.delete(saved)
+        return name
@@ -0,0 +1,40 @@
+from django.core.mail import EmailMultiAlternatives
+from django.utils import timezone
+
+from blog.caches import PAGES_VERSION, bump_version
+from blog.jobs import task
+from blog.maintenance import (
+    build_thumbnails, collect_image, mark_thumbnails
+)
+from blog.models import Post
+
+
+@task
+def make_thumbnails(name):
+    build_thumbnails(name, overwrite=False)
+    mark_thumbnails([name])
+
+
+@task
+def delete_image(name):
+    collect_image(name)
+
+
+@task
+def touch_posts(**lookups):
+    # Карточки публикаций в кеше привязаны к updated_at.
+    Post.objects.filter(**lookups).update(updated_at=timezone.now())
+    bump_version(PAGES_VERSION)
+
+
+@task
+def send_email(subject, body, from_email, to, html=None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html is not None:
+        message.attach_alternative(html, 'text/html')
+    message.send()
+
+
+@task
+def noop():
+    pass
@@ -1,11 +1,37 @@
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('search/', views.search, name='search'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap'),
+    path(
+        'sitemap-<slug:section>-<int:shard>.xml',
+        views.sitemap_section,
+        name='sitemap_section'
+    ),
+    path('feeds/rss/', feeds.feed_view(feeds.PostsFeed), name='feed_rss'),
+    path(
+        'feeds/atom/',
+        feeds.feed_view(feeds.AtomPostsFeed),
+        name='feed_atom'
+    ),
+    path('api/posts/', api.post_list, name='api_post_list'),
+    path('api/posts/<int:pk>/', api.post_detail, name='api_post_detail'),
+    path(
+        'api/posts/<int:pk>/comments/',
+        api.comment_list,
+        name='api_comment_list'
+    ),
+    path('api/categories/', api.category_list, name='api_category_list'),
+    path(
+        'api/profiles/<username>/',
+        api.profile_detail,
+        name='api_profile_detail'
+    ),
     path('posts/create/', views.post_create, name='create_post'),
     path(
         'posts/<post_id>/edit/',
@@ -27,11 +53,31 @@ urlpatterns = [
         views.category_posts,
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.feed_view(feeds.CategoryPostsFeed),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.feed_view(feeds.AtomCategoryPostsFeed),
+        name='category_feed_atom'
+    ),
     path(
         'profile/<username>/',
         views.profile,
         name='profile'
     ),
+    path(
+        'profile/<username>/rss/',
+        feeds.feed_view(feeds.AuthorPostsFeed),
+        name='author_feed_rss'
+    ),
+    path(
+        'profile/<username>/atom/',
+        feeds.feed_view(feeds.AtomAuthorPostsFeed),
+        name='author_feed_atom'
+    ),
     path(
         'profile/<username>/edit/',
         views.profile_edit,
@@ -1,26 +1,69 @@
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.views.decorators.http import condition
 
+from blog.caches import cache_anonymous_page
+from blog.conditional import (feed_etag, post_etag, post_last_modified,
+                              sitemap_etag)
 from blog.models import Category, Comment
-from blog.posts_list import number_posts_list
+from blog.posts_list import comments_list, paginate_posts
 from blog.forms import PostForm, UserUpdateForm, CommentForm
 from blog.redirects import redirect_profile, redirect_post
+from blog.search import search_available, search_posts
+from blog.sitemaps import (SECTIONS, cached_section_xml, index_xml,
+                           site_url)
 from blog.querysets import (posts_filter_full,
                             posts_filter_author,
                             get_post_filter_author,
                             get_post, comment)
 
 
+@condition(etag_func=feed_etag)
+@cache_anonymous_page
 def index(request):
     post_list = posts_filter_full()
 
-    post_list = number_posts_list(request, post_list)
+    post_list = paginate_posts(request, post_list, 'index')
     context = {'page_obj': post_list}
     template_name = 'blog/index.html'
     return render(request, template_name, context)
 
 
+@cache_anonymous_page
+def search(request):
+    if not search_available():
+        raise Http404
+    query = request.GET.get('q', '').strip()
+    context = {
+        'query': query,
+        'page_obj': search_posts(request, query) if query else None,
+    }
+    template_name = 'blog/search.html'
+    return render(request, template_name, context)
+
+
+@condition(etag_func=sitemap_etag)
+def sitemap_index(request):
+    return HttpResponse(
+        index_xml(site_url(request)), content_type='application/xml'
+    )
+
+
+@condition(etag_func=sitemap_etag)
+def sitemap_section(request, section, shard):
+    if section not in SECTIONS:
+        raise Http404
+    content = cached_section_xml(site_url(request), section, shard)
+    if content is None:
+        raise Http404
+    return StreamingHttpResponse(content, content_type='application/xml')
+
+
+@condition(etag_func=feed_etag)
+@cache_anonymous_page
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
@@ -29,17 +72,19 @@ def category_posts(request, category_slug):
     )
     post_list = posts_filter_full(category.id)
 
-    post_list = number_posts_list(request, post_list)
+    post_list = paginate_posts(request, post_list, f'category:{category.id}')
     template = 'blog/category.html'
     context = {'category': category, 'page_obj': post_list}
     return render(request, template, context)
 
 
+@condition(etag_func=feed_etag)
 def profile(request, username):
     profile = get_object_or_404(User, username=username)
-    post_list = posts_filter_author(profile.id, request.user)
+    post_list = posts_filter_author(profile, request.user)
 
-    post_list = number_posts_list(request, post_list)
+    feed = f'author:{profile.id}:{int(profile == request.user)}'
+    post_list = paginate_posts(request, post_list, feed)
     context = {'profile': profile, 'page_obj': post_list}
     template_name = 'blog/profile.html'
     return render(request, template_name, context)
@@ -58,14 +103,14 @@ def profile_edit(request, username):
     return render(request, template_name, context)
 
 
+@condition(etag_func=post_etag, last_modified_func=post_last_modified)
 def post_detail(request, pk):
 
     post = get_post_filter_author(pk, request.user)
 
-    comments = Comment.objects.select_related(
-        'author'
-    ).filter(
-        post=post,
+    comments = comments_list(
+        request,
+        Comment.objects.select_related('author').filter(post=post),
     )
 
     form = CommentForm()
@@ -136,7 +181,8 @@ def comment_create(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = get_post(post_id)
-        comment.save()
+        with transaction.atomic():
+            comment.save()
         return redirect_post(post_id)
 
     template_name = 'blog/comment.html'
@@ -165,7 +211,8 @@ def comment_delete(request, post_id, comment_id):
     instance = comment(comment_id, post_id, request.user)
 
     if request.method == 'POST':
-        instance.delete()
+        with transaction.atomic():
+            instance.delete()
         return redirect_post(post_id)
 
     context = {'comment': instance}
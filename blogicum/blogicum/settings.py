@@ -47,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.QueryBudgetMiddleware',
+    'blog.middleware.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,6 +92,33 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+# Базы, между которыми распределяются чтения в GET-запросах
+# (blog.routers.ReplicaRouter). Пустой список — всё идёт в default.
+DATABASE_REPLICAS = []
+
+# Сколько секунд после записи пользователь читает из основной базы,
+# чтобы видеть свои изменения, пока реплики не догнали её.
+REPLICA_PIN_SECONDS = 5
+
+# PRAGMA, которые выполняются при каждом новом подключении к SQLite
+# (blog.signals.sqlite_connected). Для разработки оставлены значения SQLite
+# по умолчанию; настройки для продакшена — в blogicum/settings_production.py.
+SQLITE_PRAGMAS = {}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Подходит и файловый кеш: 'django.core.cache.backends.filebased.FileBasedCache'
+# с 'LOCATION' — каталогом для файлов кеша.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -153,3 +182,59 @@ MEDIA_ROOT = BASE_DIR / 'media'
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
+
+# Пагинация лент публикаций: 'number' — по номерам страниц (?page=N),
+# 'cursor' — по курсору (?after=/?before=) без OFFSET и COUNT(*).
+POSTS_PAGINATION = 'number'
+
+# Общее число публикаций в ленте кешируется на POSTS_COUNT_TIMEOUT секунд
+# и сбрасывается при сохранении и удалении публикаций и категорий.
+POSTS_COUNT_TIMEOUT = 60
+
+# Если задано, подсчёт публикаций в ленте ограничивается этим числом
+# (для очень больших таблиц): COUNT(*) по подзапросу с LIMIT. Когда
+# публикаций больше, число страниц не показывается, а переход дальше
+# идёт по одной странице (blog.posts_list.FeedPaginator).
+POSTS_COUNT_LIMIT = None
+
+# Время жизни кеша страниц лент и статических страниц для анонимных
+# посетителей; кеш сбрасывается при изменении публикаций и комментариев.
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Допустимое число запросов к БД на один запрос к странице. При превышении
+# бюджета в режиме QUERY_BUDGET_STRICT запрос завершается ошибкой,
+# иначе в лог пишется предупреждение.
+QUERY_BUDGETS = {
+    'blog:index': 5,
+    'blog:category_posts': 6,
+    'blog:profile': 6,
+    'blog:post_detail': 5,
+    'blog:search': 4,
+    'blog:api_post_list': 5,
+    'blog:api_post_detail': 3,
+    'blog:api_comment_list': 4,
+    'blog:api_category_list': 3,
+    'blog:api_profile_detail': 3,
+}
+
+QUERY_BUDGET_STRICT = DEBUG
+
+# Фоновые задачи (blog.jobs) выполняет команда run_jobs. Неудачная задача
+# повторяется до JOBS_MAX_ATTEMPTS раз с паузой JOBS_RETRY_DELAY секунд,
+# удваивающейся с каждой попыткой; задача, взятая воркером больше
+# JOBS_LOCK_TIMEOUT секунд назад, считается брошенной.
+JOBS_MAX_ATTEMPTS = 5
+
+JOBS_RETRY_DELAY = 30
+
+JOBS_LOCK_TIMEOUT = 10 * 60
+
+# Картинки публикаций хранятся по хешу содержимого (blog.storage) и
+# удаляются, когда на них не ссылается ни одна публикация. Файлы, к которым
+# обращались за последние ORPHAN_IMAGE_GRACE_PERIOD секунд, не удаляются:
+# их может ждать ещё не сохранённая публикация.
+ORPHAN_IMAGE_GRACE_PERIOD = 60 * 60
+
+# Время жизни кеша карты сайта (индекса и каждого шарда); кеш сбрасывается
+# при изменении публикаций и категорий.
+SITEMAP_CACHE_TIMEOUT = 60 * 60
@@ -0,0 +1,47 @@
+"""
+Настройки для продакшена. Подключаются через
+DJANGO_SETTINGS_MODULE=blogicum.settings_production или
+python manage.py <команда> --settings=blogicum.settings_production.
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, INSTALLED_APPS, MIDDLEWARE, SECRET_KEY
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get(
+    'DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar.')
+]
+
+QUERY_BUDGET_STRICT = False
+
+# Подключение к базе живёт между запросами, поэтому PRAGMA выполняются
+# один раз на подключение, а не на каждый запрос.
+DATABASES = {
+    'default': {**DATABASES['default'], 'CONN_MAX_AGE': 10 * 60},
+}
+
+# WAL: читатели не ждут пишущего и наоборот, ждут друг друга только
+# пишущие. synchronous = NORMAL в режиме WAL не теряет целостность
+# при сбое, но не вызывает fsync на каждую транзакцию. busy_timeout —
+# сколько миллисекунд ждать блокировку, прежде чем вернуть
+# «database is locked». cache_size в отрицательных значениях — КиБ.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
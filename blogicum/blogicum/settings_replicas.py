@@ -0,0 +1,26 @@
+"""
+Продакшен с репликами только для чтения: GET-запросы читают из реплик,
+а записи и чтения после них идут в основную базу
+(blog.routers.ReplicaRouter, blog.middleware.ReplicaPinningMiddleware).
+Файлы реплик перечисляются через запятую в DJANGO_REPLICA_DATABASES.
+"""
+
+import os
+
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import DATABASES
+
+REPLICA_FILES = [
+    name for name in os.environ.get('DJANGO_REPLICA_DATABASES', '').split(',')
+    if name
+]
+
+DATABASES = {
+    'default': DATABASES['default'],
+    **{
+        f'replica_{number}': {**DATABASES['default'], 'NAME': name}
+        for number, name in enumerate(REPLICA_FILES)
+    },
+}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
@@ -0,0 +1,13 @@
+"""
+Настройки для тестов: к основной базе добавлена реплика, на которой
+tests/test_replicas.py проверяет маршрутизацию чтений
+(blog.routers.ReplicaRouter). В тестах обе базы создаются в памяти.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+DATABASES = {
+    **DATABASES,
+    'replica': {**DATABASES['default']},
+}
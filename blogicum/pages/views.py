@@ -1,11 +1,16 @@
 from django.views.generic import TemplateView
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 
+from blog.caches import cache_anonymous_page
 
+
+@method_decorator(cache_anonymous_page, name='dispatch')
 class AboutView(TemplateView):
     template_name = 'pages/about.html'
 
 
+@method_decorator(cache_anonymous_page, name='dispatch')
 class RulesView(TemplateView):
     template_name = 'pages/rules.html'
 
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from blog.api import api_view
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def make_post(user, published_category):
+    def make(title, **kwargs):
+        kwargs.setdefault('pub_date', timezone.now())
+        kwargs.setdefault('author', user)
+        return Post.objects.create(
+            title=title, text='Текст', category=published_category, **kwargs
+        )
+    return make
+
+
+def test_post_list_paginates_visible_posts(client, make_post):
+    now = timezone.now()
+    for i in range(13):
+        make_post(f'Публикация {i}', pub_date=now - timedelta(minutes=i))
+    make_post('Снятая публикация', is_published=False)
+
+    titles = []
+    url = '/api/posts/'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        titles += [post['title'] for post in data['results']]
+        url = data['next']
+    assert titles == [f'Публикация {i}' for i in range(13)], (
+        'Убедитесь, что API отдаёт видимые публикации по курсору '
+        'от новых к старым без повторов и пропусков.'
+    )
+
+
+def test_post_list_skips_text_and_supports_fields(client, make_post):
+    post = make_post('Публикация')
+    data = client.get('/api/posts/').json()['results'][0]
+    assert 'text' not in data, (
+        'Убедитесь, что список публикаций API не отдаёт текст по умолчанию.'
+    )
+    assert data['author'] == post.author.username
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/api/posts/?fields=id,title')
+    assert response.json()['results'] == [{'id': post.id, 'title': post.title}]
+    assert not any(
+        '"text"' in query['sql'] for query in context.captured_queries
+    ), 'Убедитесь, что поля, которых нет в ?fields=, не читаются из базы.'
+
+    response = client.get('/api/posts/?fields=title,password')
+    assert response.status_code == 400
+    assert 'password' in response.json()['error']
+
+
+def test_post_detail_visibility(client, user_client, make_post):
+    hidden = make_post('Черновик', is_published=False)
+    assert client.get(f'/api/posts/{hidden.id}/').status_code == 404
+    response = user_client.get(f'/api/posts/{hidden.id}/')
+    assert response.status_code == 200, (
+        'Убедитесь, что автор видит в API свои скрытые публикации.'
+    )
+    assert response.json()['text'] == 'Текст'
+
+
+def test_filters_by_category_and_author(client, make_post, published_category):
+    other = mixer.blend('auth.User')
+    make_post('Моя')
+    make_post('Чужая', author=other)
+
+    data = client.get(f'/api/posts/?author={other.username}').json()
+    assert [post['title'] for post in data['results']] == ['Чужая']
+    data = client.get(
+        f'/api/posts/?category={published_category.slug}'
+    ).json()
+    assert len(data['results']) == 2
+    assert client.get('/api/posts/?category=unknown').status_code == 404
+
+
+def test_comments_categories_and_profile(client, user, make_post):
+    post = make_post('Публикация')
+    for i in range(3):
+        Comment.objects.create(post=post, author=user, text=f'Комментарий {i}')
+
+    data = client.get(f'/api/posts/{post.id}/comments/').json()
+    assert [comment['text'] for comment in data['results']] == [
+        f'Комментарий {i}' for i in range(3)
+    ]
+    assert data['next'] is None
+
+    categories = client.get('/api/categories/?fields=slug').json()
+    assert categories['results'] == [{'slug': post.category.slug}]
+
+    profile = client.get(f'/api/profiles/{user.username}/').json()
+    assert profile['username'] == user.username
+    assert 'password' not in profile
+
+
+def test_api_views_keep_metadata():
+    def post_stats(request):
+        """Статистика публикаций."""
+
+    view = api_view(post_stats)
+    assert view.__qualname__ == post_stats.__qualname__, (
+        'Убедитесь, что api_view сохраняет метаданные функции '
+        'представления (functools.wraps).'
+    )
+    assert view.__doc__ == post_stats.__doc__
+    assert view.__wrapped__.__wrapped__ is post_stats
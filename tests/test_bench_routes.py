@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+pytestmark = [pytest.mark.django_db]
+
+OPTIONS = {'posts': 5, 'comments': 2, 'repeat': 1}
+
+
+def bench(**options):
+    stdout = io.StringIO()
+    call_command(
+        'bench_routes', **OPTIONS, **options,
+        stdout=stdout, stderr=io.StringIO(),
+    )
+    return stdout.getvalue()
+
+
+def test_bench_routes_covers_all_routes(tmp_path):
+    baseline = tmp_path / 'routes.json'
+    bench(baseline=baseline, save=True)
+    routes = json.loads(baseline.read_text(encoding='utf-8'))['routes']
+    for name in (
+        'blog:index [аноним]',
+        'blog:post_detail [пользователь]',
+        'pages:about [аноним]',
+        'login [аноним]',
+        'registration [пользователь]',
+    ):
+        assert name in routes, (
+            f'Убедитесь, что бенчмарк замеряет адрес {name}.'
+        )
+    for name, result in routes.items():
+        assert result['status'] < 400, (
+            f'Убедитесь, что адрес {name} отвечает без ошибки.'
+        )
+        assert {'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes'} <= set(
+            result
+        )
+    assert routes['blog:post_detail [пользователь]']['bytes'] > 0
+
+
+def test_bench_routes_fails_on_regression(tmp_path):
+    baseline = tmp_path / 'routes.json'
+    options = {'routes': ['blog:index', 'pages:rules'], 'baseline': baseline}
+    bench(save=True, **options)
+    assert 'Регрессий' in bench(threshold=100, min_delta_ms=1000, **options)
+
+    report = json.loads(baseline.read_text(encoding='utf-8'))
+    report['routes']['blog:index [пользователь]']['queries'] -= 1
+    baseline.write_text(json.dumps(report), encoding='utf-8')
+    with pytest.raises(CommandError):
+        bench(threshold=100, min_delta_ms=1000, **options)
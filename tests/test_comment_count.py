@@ -0,0 +1,114 @@
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_comment_count(post):
+    return Post.objects.values_list('comment_count', flat=True).get(pk=post.pk)
+
+
+def test_comment_count_follows_views(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for i in range(3):
+        user_client.post(
+            f'/posts/{post.id}/comment/', data={'text': f'Комментарий {i}'}
+        )
+    assert get_comment_count(post) == 3, (
+        'Убедитесь, что при создании комментария увеличивается '
+        'счётчик комментариев публикации.'
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    assert get_comment_count(post) == 2, (
+        'Убедитесь, что при удалении комментария уменьшается '
+        'счётчик комментариев публикации.'
+    )
+
+
+def test_post_save_keeps_comment_count(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    post.title = 'Новый заголовок'
+    post.save()
+    assert get_comment_count(post) == 1
+
+
+def test_post_save_with_update_fields_keeps_derived_fields(
+        post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    updated_at = post.updated_at
+    post.text = 'Совсем другой текст публикации'
+    post.is_published = False
+    post.save(update_fields=['text', 'is_published'])
+    saved = Post.objects.get(pk=post.pk)
+    assert saved.excerpt == 'Совсем другой текст публикации', (
+        'Убедитесь, что `Post.save(update_fields=...)` сохраняет '
+        'пересчитанную выдержку.'
+    )
+    assert not saved.is_visible
+    assert saved.updated_at > updated_at
+
+
+def test_post_save_after_delete_raises(post_with_published_location):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    Post.objects.filter(pk=post.pk).delete()
+    with pytest.raises(DatabaseError, match='did not affect any rows'):
+        with transaction.atomic():
+            post.save()
+    assert not Post.objects.filter(pk=post.pk).exists()
+
+
+def test_recount_comments(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    Comment.objects.bulk_create(
+        Comment(post=post, author=user, text=f'Комментарий {i}')
+        for i in range(5)
+    )
+    assert get_comment_count(post) == 0
+
+    call_command('recount_comments', batch_size=1)
+    assert get_comment_count(post) == 5, (
+        'Убедитесь, что команда `recount_comments` восстанавливает '
+        'счётчики комментариев.'
+    )
+
+
+def test_loaddata_keeps_comment_count(
+        tmp_path, user, post_with_published_location
+):
+    post = post_with_published_location
+    for i in range(3):
+        Comment.objects.create(post=post, author=user, text=f'Текст {i}')
+    fixture = tmp_path / 'post.json'
+    call_command(
+        'dumpdata', 'blog.post', 'blog.comment', output=str(fixture)
+    )
+    Comment.objects.all().delete()
+    call_command('loaddata', str(fixture), verbosity=0)
+    assert get_comment_count(post) == 3, (
+        'Убедитесь, что загрузка фикстуры не увеличивает счётчик '
+        'комментариев повторно.'
+    )
+
+
+def test_comment_delete_with_drifted_count(
+        user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    comment = Comment.objects.create(post=post, author=user, text='Текст')
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    response = user_client.post(
+        f'/posts/{post.id}/delete_comment/{comment.id}/'
+    )
+    assert response.status_code == 302
+    assert get_comment_count(post) == 0
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_feed_urls(post):
+    return (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+    )
+
+
+def test_feeds_answer_not_modified(client, post_with_published_location):
+    for url in get_feed_urls(post_with_published_location):
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag, f'Убедитесь, что страница `{url}` возвращает ETag.'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Убедитесь, что страница `{url}` отвечает 304, '
+            'если ETag не изменился.'
+        )
+        assert len(context.captured_queries) == 0
+
+
+def test_feed_etag_changes(client, user_client, post_with_published_location):
+    post = post_with_published_location
+    for url in get_feed_urls(post):
+        etag = client.get(url)['ETag']
+        user_client.post(
+            f'/posts/{post.id}/comment/', data={'text': 'Комментарий'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Убедитесь, что ETag страницы `{url}` меняется после '
+            'добавления комментария.'
+        )
+
+
+def test_feed_etag_depends_on_user(
+        client, user_client, post_with_published_location
+):
+    etag = client.get('/')['ETag']
+    response = user_client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+def test_post_detail_conditional_get(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    response = user_client.get(url)
+    etag, last_modified = response['ETag'], response['Last-Modified']
+
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+    assert user_client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == 304
+
+    another_user_client.post(f'{url}comment/', data={'text': 'Комментарий'})
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что страница публикации перестаёт отвечать 304 '
+        'после добавления комментария.'
+    )
+
+
+def test_missing_post_has_no_validators(user_client):
+    response = user_client.get('/posts/100500/')
+    assert response.status_code == 404
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Category, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def create_posts(n, author, category):
+    pub_date = timezone.now() - timedelta(days=1)
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {i}',
+            text='Текст публикации',
+            pub_date=pub_date,
+            author=author,
+            category=category,
+            is_visible=True,
+        )
+        for i in range(n)
+    )
+
+
+def get_feed(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    count_queries = [
+        query for query in context.captured_queries
+        if 'COUNT(*)' in query['sql']
+    ]
+    return response.context['page_obj'], len(count_queries)
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(
+        title='Категория', description='Описание', slug='category'
+    )
+
+
+@pytest.mark.parametrize('url_name', ('index', 'category_posts', 'profile'))
+def test_feed_count_is_cached(user_client, user, category, url_name):
+    url = {
+        'index': '/',
+        'category_posts': f'/category/{category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }[url_name]
+    create_posts(25, user, category)
+
+    page_obj, n_count_queries = get_feed(user_client, url)
+    assert page_obj.paginator.count == 25
+    assert n_count_queries == 1
+
+    page_obj, n_count_queries = get_feed(user_client, url + '?page=2')
+    assert page_obj.paginator.count == 25
+    assert n_count_queries == 0, (
+        f'Убедитесь, что количество публикаций на странице `{url}` '
+        'берётся из кеша при повторном запросе.'
+    )
+
+    Post.objects.filter(category=category).first().delete()
+    page_obj, n_count_queries = get_feed(user_client, url)
+    assert page_obj.paginator.count == 24, (
+        'Убедитесь, что кеш количества публикаций сбрасывается '
+        'при удалении публикации.'
+    )
+    assert n_count_queries == 1
+
+
+def test_category_toggle_resets_count(user_client, user, category):
+    create_posts(15, user, category)
+    page_obj, _ = get_feed(user_client, '/')
+    assert page_obj.paginator.count == 15
+
+    category.is_published = False
+    category.save()
+    page_obj, _ = get_feed(user_client, '/')
+    assert page_obj.paginator.count == 0
+
+
+@override_settings(POSTS_COUNT_LIMIT=20)
+def test_feed_count_limit(user_client, user, category):
+    create_posts(35, user, category)
+    page_obj, _ = get_feed(user_client, '/')
+    assert page_obj.paginator.count == 21
+    assert page_obj.has_next()
+
+    page_obj, _ = get_feed(user_client, '/?page=3')
+    assert page_obj.number == 3, (
+        'Убедитесь, что страницы за пределом POSTS_COUNT_LIMIT доступны.'
+    )
+    assert page_obj.has_next(), (
+        'Убедитесь, что за пределом POSTS_COUNT_LIMIT работает переход '
+        'на следующую страницу.'
+    )
+
+    page_obj, _ = get_feed(user_client, '/?page=4')
+    assert len(page_obj) == 5
+    assert not page_obj.has_next()
+
+
+@override_settings(POSTS_COUNT_LIMIT=20)
+def test_feed_count_limit_not_reached(user_client, user, category):
+    create_posts(15, user, category)
+    page_obj, _ = get_feed(user_client, '/?page=5')
+    assert page_obj.paginator.count == 15
+    assert page_obj.number == page_obj.paginator.num_pages == 2
@@ -0,0 +1,101 @@
+import io
+from collections import Counter
+from datetime import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from blog.datasets import chunks, generate_chunk
+from blog.models import Category, Comment, Post, User
+from blog.search import search_ids
+
+pytestmark = [pytest.mark.django_db]
+
+NOW = datetime.fromisoformat('2026-01-01T12:00:00+00:00')
+
+SIZES = {
+    'locations': 5,
+    'categories': 20,
+    'users': 30,
+    'posts': 400,
+    'comments': 600,
+}
+
+
+def generate(**options):
+    call_command(
+        'generate_dataset', **{**SIZES, **options},
+        now=NOW, processes=1, stdout=io.StringIO(),
+    )
+
+
+def test_same_seed_gives_same_rows():
+    plan = {
+        **SIZES, 'seed': 3, 'prefix': 'gen3', 'scheduled': 0.1,
+        'unpublished': 0.1, 'password': '!',
+        'now': NOW,
+        'first_ids': dict.fromkeys(SIZES, 1),
+    }
+    first = [generate_chunk(plan, *chunk) for chunk in chunks(plan, 100)]
+    second = [generate_chunk(plan, *chunk) for chunk in chunks(plan, 100)]
+    assert first == second, (
+        'Убедитесь, что генератор с одним и тем же seed создаёт '
+        'одинаковые строки.'
+    )
+    other = [
+        generate_chunk({**plan, 'seed': 4}, *chunk)
+        for chunk in chunks(plan, 100)
+    ]
+    assert first != other
+
+
+def test_generated_dataset_is_consistent():
+    generate(scheduled=0.1, unpublished=0.1)
+    assert Post.objects.count() == SIZES['posts']
+    assert Comment.objects.count() == SIZES['comments']
+    assert Category.objects.filter(is_published=False).exists(), (
+        'Убедитесь, что среди созданных категорий есть снятые '
+        'с публикации.'
+    )
+    assert Post.objects.filter(is_published=False).exists()
+    assert Post.objects.filter(pub_date__gt=NOW).count() == 40, (
+        'Убедитесь, что доля отложенных публикаций задаётся --scheduled.'
+    )
+    visible = Post.objects.filter(
+        is_published=True, pub_date__lte=NOW, category__is_published=True,
+    )
+    assert set(Post.objects.filter(is_visible=True)) == set(visible), (
+        'Убедитесь, что генератор правильно заполняет поле is_visible.'
+    )
+    for post in Post.objects.annotate(total=Count('comments')):
+        assert post.comment_count == post.total, (
+            'Убедитесь, что после генерации пересчитаны счётчики '
+            'комментариев.'
+        )
+    post = Post.objects.order_by('id').first()
+    assert post.excerpt and post.text.startswith(post.excerpt.split()[0])
+    found = dict(search_ids(post.text.split()[0]))
+    assert post.id in found, (
+        'Убедитесь, что созданные публикации попадают в поисковый индекс.'
+    )
+
+
+def test_generated_dataset_is_skewed():
+    generate()
+    authors = Counter(Post.objects.values_list('author', flat=True))
+    top = max(authors.values())
+    assert top > 4 * SIZES['posts'] / SIZES['users'], (
+        'Убедитесь, что у нескольких авторов публикаций намного '
+        'больше среднего.'
+    )
+
+
+def test_generation_appends_to_existing_data(user):
+    generate()
+    generate()
+    assert User.objects.count() == 2 * SIZES['users'] + 1, (
+        'Убедитесь, что повторный запуск добавляет данные, а не '
+        'перезаписывает существующие.'
+    )
+    assert Post.objects.count() == 2 * SIZES['posts']
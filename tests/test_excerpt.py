@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.benchmarks import create_posts
+from blog.maintenance import fill_excerpts
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(200))
+
+
+@pytest.fixture
+def long_post(user, published_category):
+    return Post.objects.create(
+        title='Длинная публикация', text=LONG_TEXT, author=user,
+        category=published_category, pub_date=timezone.now(),
+    )
+
+
+def test_excerpt_follows_text(long_post):
+    assert long_post.excerpt == truncatewords(LONG_TEXT, 10)
+    long_post.text = 'Новый короткий текст'
+    long_post.save()
+    long_post.refresh_from_db()
+    assert long_post.excerpt == 'Новый короткий текст', (
+        'Убедитесь, что анонс публикации пересчитывается при сохранении.'
+    )
+
+
+@pytest.mark.parametrize('url', ('/', '/category/{slug}/', '/profile/{user}/'))
+def test_feeds_do_not_load_text(client, long_post, url):
+    cache.clear()
+    url = url.format(
+        slug=long_post.category.slug, user=long_post.author.username
+    )
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    content = response.content.decode('utf-8')
+    assert truncatewords(LONG_TEXT, 10) in content
+    assert 'слово199' not in content
+    assert not any(
+        '"blog_post"."text"' in query['sql']
+        for query in context.captured_queries
+    ), 'Убедитесь, что ленты не загружают полный текст публикаций.'
+
+
+def test_syndication_feed_keeps_full_text(client, long_post):
+    assert 'слово199' in client.get('/feeds/rss/').content.decode('utf-8')
+
+
+def test_fill_excerpts(long_post):
+    Post.objects.update(excerpt='')
+    assert fill_excerpts(batch_size=1) == 1
+    long_post.refresh_from_db()
+    assert long_post.excerpt == truncatewords(LONG_TEXT, 10)
+    assert fill_excerpts() == 0
+
+
+def test_loaddata_fills_excerpt(tmp_path, long_post):
+    fixture = tmp_path / 'post.json'
+    call_command('dumpdata', 'blog.post', output=str(fixture))
+    # Фикстуры, снятые до появления анонсов, его не содержат.
+    objects = json.loads(fixture.read_text(encoding='utf-8'))
+    for obj in objects:
+        del obj['fields']['excerpt']
+    fixture.write_text(json.dumps(objects), encoding='utf-8')
+    Post.objects.update(excerpt='')
+    call_command('loaddata', str(fixture), verbosity=0)
+    long_post.refresh_from_db()
+    assert long_post.excerpt == truncatewords(LONG_TEXT, 10), (
+        'Убедитесь, что при загрузке фикстуры заполняется анонс.'
+    )
+
+
+@pytest.mark.parametrize('text', [LONG_TEXT, lambda i: f'{LONG_TEXT} {i}'])
+def test_bench_posts_have_excerpt(user, published_category, text):
+    create_posts(3, text, author=user, category=published_category)
+    excerpts = set(Post.objects.values_list('excerpt', flat=True))
+    assert excerpts == {truncatewords(LONG_TEXT, 10)}, (
+        'Убедитесь, что публикации для замеров создаются с выдержкой.'
+    )
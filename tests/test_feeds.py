@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.maintenance import publish_scheduled
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+FEEDS = {
+    'rss': 'application/rss+xml',
+    'atom': 'application/atom+xml',
+}
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return {
+        'index': '/feeds/{kind}/',
+        'category': f'/category/{published_category.slug}/{{kind}}/',
+        'author': f'/profile/{user.username}/{{kind}}/',
+    }
+
+
+@pytest.fixture
+def make_post(user, published_category):
+    def make(title, **kwargs):
+        kwargs.setdefault('pub_date', timezone.now())
+        return Post.objects.create(
+            title=title, text='Текст', author=user,
+            category=published_category, **kwargs
+        )
+    return make
+
+
+@pytest.mark.parametrize('kind', FEEDS)
+@pytest.mark.parametrize('feed', ('index', 'category', 'author'))
+def test_feed_lists_visible_posts(
+        user_client, feed_urls, make_post, feed, kind
+):
+    make_post('Видимая публикация')
+    make_post('Снятая публикация', is_published=False)
+    make_post(
+        'Отложенная публикация',
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+
+    response = user_client.get(feed_urls[feed].format(kind=kind))
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith(FEEDS[kind])
+    content = response.content.decode('utf-8')
+    assert 'Видимая публикация' in content
+    assert 'Снятая публикация' not in content, (
+        'Убедитесь, что в ленты не попадают скрытые публикации, '
+        'даже если ленту запрашивает их автор.'
+    )
+    assert 'Отложенная публикация' not in content
+
+
+def test_unpublished_category_feed_not_found(client, published_category):
+    published_category.is_published = False
+    published_category.save()
+    response = client.get(f'/category/{published_category.slug}/rss/')
+    assert response.status_code == 404
+
+
+def test_feed_is_cached_and_invalidated(client, make_post):
+    make_post('Первая')
+    client.get('/feeds/rss/')
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/feeds/rss/')
+    assert 'Первая' in response.content.decode('utf-8')
+    assert not context.captured_queries, (
+        'Убедитесь, что повторный запрос ленты отдаётся из кеша.'
+    )
+
+    make_post('Вторая')
+    assert 'Вторая' in client.get('/feeds/rss/').content.decode('utf-8')
+
+    make_post('Запланированная', pub_date=timezone.now() + timedelta(days=1))
+    Post.objects.filter(title='Запланированная').update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    publish_scheduled()
+    assert 'Запланированная' in client.get('/feeds/rss/').content.decode(
+        'utf-8'
+    ), 'Убедитесь, что кеш ленты сбрасывается при публикации.'
+
+
+def test_feed_conditional_get(client, make_post):
+    make_post('Публикация')
+    response = client.get('/feeds/atom/')
+    etag = response['ETag']
+    last_modified = response['Last-Modified']
+
+    assert client.get(
+        '/feeds/atom/', HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+    assert client.get(
+        '/feeds/atom/', HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == 304
+
+    make_post('Новая публикация')
+    assert client.get(
+        '/feeds/atom/', HTTP_IF_NONE_MATCH=etag
+    ).status_code == 200
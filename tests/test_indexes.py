@@ -0,0 +1,57 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment
+from blog.querysets import posts_filter_author, posts_filter_full
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='Проверяется план запроса SQLite.',
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    'name, get_queryset, index',
+    (
+        ('index', lambda user: posts_filter_full(), 'post_visible_feed_idx'),
+        (
+            'category',
+            lambda user: posts_filter_full(category_id=1),
+            'post_category_feed_idx',
+        ),
+        (
+            'profile',
+            lambda user: posts_filter_author(user, None),
+            'post_author_feed_idx',
+        ),
+        (
+            'own profile',
+            lambda user: posts_filter_author(user, user),
+            'post_author_feed_idx',
+        ),
+        (
+            'comments',
+            lambda user: Comment.objects.filter(post_id=1),
+            'comment_post_created_idx',
+        ),
+    ),
+)
+def test_feed_queries_use_indexes(user, name, get_queryset, index):
+    plan = get_queryset(user)[:10].explain()
+    assert f'INDEX {index}' in plan, (
+        f'Убедитесь, что запрос «{name}» использует индекс `{index}`:\n{plan}'
+    )
+    table_scans = [
+        line for line in plan.splitlines()
+        if ' SCAN ' in line and ' USING ' not in line
+    ]
+    assert not table_scans, (
+        f'Убедитесь, что запрос «{name}» не читает таблицу целиком:\n{plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Убедитесь, что запрос «{name}» не сортирует строки '
+        f'без индекса:\n{plan}'
+    )
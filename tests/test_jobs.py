@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.db import transaction
+from django.utils import timezone
+
+from blog.jobs import TASKS, claim, enqueue, requeue_stale, run_pending
+from blog.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def flaky_task():
+    calls = []
+
+    def flaky(fail_times):
+        calls.append(fail_times)
+        if len(calls) <= fail_times:
+            raise RuntimeError('Сбой задачи')
+
+    TASKS['flaky'] = flaky
+    yield calls
+    del TASKS['flaky']
+
+
+def make_due():
+    Job.objects.update(run_at=timezone.now())
+
+
+def test_job_runs_and_is_removed(flaky_task):
+    enqueue('flaky', {'fail_times': 0})
+    assert run_pending() == 1
+    assert flaky_task == [0]
+    assert not Job.objects.exists()
+
+
+def test_failed_job_is_retried_with_backoff(settings, flaky_task):
+    settings.JOBS_RETRY_DELAY = 10
+    enqueue('flaky', {'fail_times': 2})
+
+    run_pending()
+    job = Job.objects.get()
+    assert job.status == Job.QUEUED
+    assert job.attempts == 1
+    assert 'Сбой задачи' in job.last_error
+    assert job.run_at > timezone.now() + timedelta(seconds=5)
+    assert run_pending() == 0, (
+        'Убедитесь, что неудачная задача повторяется не раньше, '
+        'чем через паузу.'
+    )
+
+    make_due()
+    run_pending()
+    job = Job.objects.get()
+    assert job.run_at > timezone.now() + timedelta(seconds=15), (
+        'Убедитесь, что пауза между повторами растёт с каждой попыткой.'
+    )
+
+    make_due()
+    run_pending()
+    assert not Job.objects.exists()
+    assert len(flaky_task) == 3
+
+
+def test_job_fails_after_max_attempts(settings, flaky_task):
+    settings.JOBS_MAX_ATTEMPTS = 2
+    enqueue('flaky', {'fail_times': 5})
+    run_pending()
+    make_due()
+    run_pending()
+    job = Job.objects.get()
+    assert job.status == Job.FAILED
+    assert job.attempts == 2
+    make_due()
+    assert run_pending() == 0
+
+
+def test_stale_job_is_requeued(flaky_task):
+    job = enqueue('flaky', {'fail_times': 0})
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.RUNNING, locked_at=timezone.now() - timedelta(days=1)
+    )
+    assert run_pending() == 1
+    assert flaky_task == [0]
+
+
+def test_stale_job_fails_after_max_attempts(settings, flaky_task):
+    settings.JOBS_MAX_ATTEMPTS = 2
+    job = enqueue('flaky', {'fail_times': 0})
+    for attempts in range(1, 3):
+        make_due()
+        claim(1)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(days=1)
+        )
+        requeue_stale()
+        job.refresh_from_db()
+        assert job.attempts == attempts
+    assert job.status == Job.FAILED, (
+        'Убедитесь, что задача, зависшая `JOBS_MAX_ATTEMPTS` раз, '
+        'не возвращается в очередь.'
+    )
+    make_due()
+    assert run_pending() == 0
+    assert flaky_task == []
+
+
+def test_job_is_dropped_with_rolled_back_transaction():
+    with transaction.atomic():
+        enqueue('noop')
+        transaction.set_rollback(True)
+    assert not Job.objects.exists()
+
+
+def test_unknown_task_is_rejected():
+    with pytest.raises(KeyError):
+        enqueue('no_such_task')
+
+
+def test_password_reset_email_is_sent_by_worker(client, user):
+    user.email = 'user@example.com'
+    user.save()
+    response = client.post(
+        '/auth/password_reset/', data={'email': user.email}
+    )
+    assert response.status_code == 302
+    assert not mail.outbox, (
+        'Убедитесь, что письмо для сброса пароля отправляется не в запросе, '
+        'а фоновой задачей.'
+    )
+    run_pending()
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
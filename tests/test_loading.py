@@ -0,0 +1,91 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import transaction
+
+from blog.loading import iter_objects, load_fixture, rebuild_derived
+from blog.search import search_ids
+
+pytestmark = [pytest.mark.django_db]
+
+FIXTURE = Path(__file__).resolve().parent.parent / 'db.json'
+
+# Поле выставляется в текущее время при разборе фикстуры.
+VOLATILE_FIELDS = {'updated_at'}
+
+
+def snapshot(labels):
+    return {
+        label: [
+            {
+                name: value for name, value in row.items()
+                if name not in VOLATILE_FIELDS
+            }
+            for row in apps.get_model(label).objects.order_by('pk').values()
+        ]
+        for label in labels
+    }
+
+
+def test_iter_objects_streams_whole_fixture():
+    expected = json.loads(FIXTURE.read_text(encoding='utf-8'))
+    with open(FIXTURE, encoding='utf-8') as stream:
+        assert list(iter_objects(stream, read_size=7)) == expected, (
+            'Убедитесь, что потоковый разбор фикстуры возвращает те же '
+            'объекты, что и json.load, при любом размере блока.'
+        )
+    with pytest.raises(ValueError):
+        list(iter_objects(io.StringIO('[{"model": "blog.post"}')))
+
+
+def test_load_fixture_matches_loaddata():
+    labels = {
+        item['model']
+        for item in json.loads(FIXTURE.read_text(encoding='utf-8'))
+    }
+    with transaction.atomic():
+        call_command('loaddata', str(FIXTURE), verbosity=0)
+        expected = snapshot(labels)
+        expected_search = search_ids('день')
+        transaction.set_rollback(True)
+    assert not snapshot(['blog.post'])['blog.post']
+
+    counts = load_fixture(FIXTURE, batch_size=10)
+    rebuild_derived(set(counts))
+    assert {model._meta.label_lower for model in counts} == labels
+    assert snapshot(labels) == expected, (
+        'Убедитесь, что load_fixture загружает те же строки, что и loaddata.'
+    )
+    assert search_ids('день') == expected_search, (
+        'Убедитесь, что после загрузки перестраивается индекс поиска.'
+    )
+
+
+def test_load_fixture_overwrites_existing_rows():
+    load_fixture(FIXTURE)
+    Post = apps.get_model('blog.post')
+    Post.objects.update(title='Изменено')
+    load_fixture(FIXTURE, batch_size=7)
+    assert not Post.objects.filter(title='Изменено').exists(), (
+        'Убедитесь, что повторная загрузка, как и loaddata, перезаписывает '
+        'строки с теми же ключами.'
+    )
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_load_fixture_rebuilds_derived_fields_in_target_database():
+    call_command(
+        'load_fixture', str(FIXTURE), database='replica',
+        stdout=io.StringIO(),
+    )
+    posts = apps.get_model('blog.post').objects.using('replica')
+    assert posts.exists()
+    assert posts.filter(is_visible=True).exists(), (
+        'Убедитесь, что load_fixture пересчитывает видимость публикаций '
+        'в той базе, куда загружена фикстура.'
+    )
+    assert not apps.get_model('blog.post').objects.using('default').exists()
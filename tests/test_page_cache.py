@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.maintenance import publish_scheduled
+from blog.models import Job, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_content(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.content.decode('utf-8'), len(context.captured_queries)
+
+
+@pytest.mark.parametrize('url', ('/', '/pages/about/', '/pages/rules/'))
+def test_anonymous_pages_are_cached(client, post_with_published_location, url):
+    get_content(client, url)
+    _, n_queries = get_content(client, url)
+    assert n_queries == 0, (
+        f'Убедитесь, что страница `{url}` для анонимного посетителя '
+        'отдаётся из кеша без лишних запросов к БД.'
+    )
+
+
+def test_category_page_is_cached(client, post_with_published_location):
+    url = f'/category/{post_with_published_location.category.slug}/'
+    get_content(client, url)
+    _, n_queries = get_content(client, url)
+    assert n_queries == 0
+
+
+def test_logged_in_pages_are_not_cached(
+        user_client, post_with_published_location
+):
+    get_content(user_client, '/')
+    _, n_queries = get_content(user_client, '/')
+    assert n_queries > 0, (
+        'Убедитесь, что страницы для авторизованных пользователей '
+        'не берутся из общего кеша.'
+    )
+
+
+def test_page_cache_is_keyed_by_query(
+        client, many_posts_with_published_locations
+):
+    first_page, _ = get_content(client, '/')
+    second_page, _ = get_content(client, '/?page=2')
+    assert first_page != second_page
+
+
+def test_page_cache_purged_on_changes(
+        client, user_client, mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    get_content(client, '/')
+
+    new_post = mixer.blend(
+        'blog.Post', author=user, category=post.category,
+        location=post.location, title='Свежая публикация',
+    )
+    content, _ = get_content(client, '/')
+    assert new_post.title in content, (
+        'Убедитесь, что кеш страниц сбрасывается при публикации поста.'
+    )
+
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    content, _ = get_content(client, '/')
+    assert 'Комментарии (1)' in content, (
+        'Убедитесь, что кеш страниц сбрасывается при изменении '
+        'количества комментариев.'
+    )
+
+    post.category.is_published = False
+    post.category.save()
+    content, _ = get_content(client, '/')
+    assert post.title not in content, (
+        'Убедитесь, что кеш страниц сбрасывается при снятии категории '
+        'с публикации.'
+    )
+
+
+def test_page_cache_purged_on_scheduled_publication(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    content, _ = get_content(client, '/')
+    assert post.title not in content
+
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    publish_scheduled()
+    content, _ = get_content(client, '/')
+    assert post.title in content, (
+        'Убедитесь, что кеш страниц сбрасывается, когда отложенная '
+        'публикация появляется в ленте.'
+    )
+
+
+def test_page_cache_purged_on_location_change_without_worker(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    response = client.get('/')
+    etag = response['ETag']
+    assert post.location.name in response.content.decode('utf-8')
+
+    post.location.is_published = False
+    post.location.save()
+    assert Job.objects.filter(name='touch_posts').exists()
+    response = client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что ETag ленты меняется при снятии места с публикации, '
+        'не дожидаясь фоновой задачи.'
+    )
+    assert post.location.name not in response.content.decode('utf-8'), (
+        'Убедитесь, что кеш страниц сбрасывается при снятии места '
+        'с публикации, не дожидаясь фоновой задачи.'
+    )
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Category, Post
+from blog.posts_list import encode_cursor
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 25
+
+
+@pytest.fixture
+def feed_posts(user):
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='category'
+    )
+    pub_date = timezone.now() - timedelta(days=1)
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {i}',
+            text='Текст публикации',
+            pub_date=pub_date - timedelta(hours=i // 3),
+            author=user,
+            category=category,
+            is_visible=True,
+        )
+        for i in range(N_POSTS)
+    )
+    return list(Post.objects.order_by('-pub_date', '-id'))
+
+
+def walk(client, url, direction, start_query=''):
+    pages = []
+    query = start_query
+    while True:
+        page_obj = client.get(url + query).context['page_obj']
+        pages.append([post.id for post in page_obj])
+        has_more = (
+            page_obj.has_next() if direction == 'after'
+            else page_obj.has_previous()
+        )
+        if not has_more:
+            return pages, page_obj
+        cursor = (
+            page_obj.next_cursor() if direction == 'after'
+            else page_obj.previous_cursor()
+        )
+        query = f'?{direction}={cursor}'
+
+
+@override_settings(POSTS_PAGINATION='cursor')
+@pytest.mark.parametrize('url_name', ('index', 'category_posts', 'profile'))
+def test_cursor_pagination(user_client, user, feed_posts, url_name):
+    url = {
+        'index': '/',
+        'category_posts': f'/category/{feed_posts[0].category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }[url_name]
+    expected = [post.id for post in feed_posts]
+
+    forward, last_page = walk(user_client, url, 'after')
+    assert sum(forward, []) == expected, (
+        'Убедитесь, что при пагинации по курсору `?after=` публикации '
+        'выводятся без пропусков и повторов, «от новых к старым».'
+    )
+    assert [len(page) for page in forward] == [10, 10, 5]
+
+    backward, first_page = walk(
+        user_client, url, 'before',
+        f'?before={last_page.previous_cursor()}'
+    )
+    assert backward[::-1] == forward[:-1], (
+        'Убедитесь, что переход назад по курсору `?before=` возвращает '
+        'те же страницы, что и переход вперёд.'
+    )
+    assert not first_page.has_previous()
+
+
+@override_settings(POSTS_PAGINATION='cursor')
+def test_cursor_pagination_bad_token(user_client, feed_posts):
+    response = user_client.get('/?after=not-a-cursor')
+    assert response.status_code == 200
+    assert [post.id for post in response.context['page_obj']] == [
+        post.id for post in feed_posts[:10]
+    ]
+
+
+@pytest.mark.parametrize('pk', ('9' * 40, '0', '-1'))
+def test_cursor_with_out_of_range_pk(client, feed_posts, pk):
+    token = encode_cursor('2020-01-01T00:00:00+00:00', pk)
+    response = client.get(f'/api/posts/?after={token}')
+    assert response.status_code == 200, (
+        'Убедитесь, что курсор с ключом вне допустимого диапазона '
+        'не приводит к ошибке сервера.'
+    )
+    with override_settings(POSTS_PAGINATION='cursor'):
+        assert client.get(f'/?after={token}').status_code == 200
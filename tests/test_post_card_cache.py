@@ -0,0 +1,77 @@
+import pytest
+from django.test import override_settings
+
+from blog.jobs import run_pending
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(params=('locmem', 'filebased'))
+def card_cache(request, tmp_path):
+    backends = {
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'post-card-tests',
+        },
+        'filebased': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+    }
+    with override_settings(CACHES={'default': backends[request.param]}):
+        yield
+
+
+def get_index(client):
+    return client.get('/').content.decode('utf-8')
+
+
+def test_post_card_is_cached(
+        card_cache, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in get_index(user_client)
+
+    Post.objects.filter(pk=post.pk).update(title='Без сигналов')
+    assert post.title in get_index(user_client), (
+        'Убедитесь, что карточка публикации берётся из кеша, пока '
+        'публикация не изменилась.'
+    )
+
+    post.refresh_from_db()
+    post.title = 'Новый заголовок'
+    post.save()
+    assert 'Новый заголовок' in get_index(user_client), (
+        'Убедитесь, что кеш карточки сбрасывается при изменении публикации.'
+    )
+
+
+@pytest.mark.parametrize('related', ('category', 'location', 'author'))
+def test_post_card_follows_related_objects(
+        card_cache, user_client, post_with_published_location, related
+):
+    post = post_with_published_location
+    get_index(user_client)
+
+    related_object = getattr(post, related)
+    field = {
+        'category': 'title', 'location': 'name', 'author': 'first_name'
+    }[related]
+    setattr(related_object, field, 'Обновлённое значение')
+    related_object.save()
+    run_pending()
+
+    assert 'Обновлённое значение' in get_index(user_client), (
+        f'Убедитесь, что кеш карточки сбрасывается при изменении `{related}`.'
+    )
+
+
+def test_post_card_follows_comments(
+        card_cache, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert 'Комментарии (0)' in get_index(user_client)
+
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    assert 'Комментарии (1)' in get_index(user_client)
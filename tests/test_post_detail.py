@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+from blog.posts_list import NUMBER_COMMENTS_LIST
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_detail_single_post_query(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    post_queries = [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "blog_post"' in query['sql']
+        or 'FROM "blog_category"' in query['sql']
+        or 'FROM "blog_location"' in query['sql']
+    ]
+    assert len(post_queries) == 2, (
+        'Убедитесь, что публикация вместе с автором, категорией и '
+        'местоположением загружается одним запросом '
+        '(не считая проверки ETag).'
+    )
+
+
+def test_post_detail_visibility(
+        user_client, another_user_client, client,
+        unpublished_posts_with_published_locations
+):
+    post = unpublished_posts_with_published_locations[0]
+    url = f'/posts/{post.id}/'
+    assert user_client.get(url).status_code == 200
+    assert another_user_client.get(url).status_code == 404
+    assert client.get(url).status_code == 404
+
+
+def test_post_detail_comments_pages(
+        user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    total = NUMBER_COMMENTS_LIST * 2 + 5
+    Comment.objects.bulk_create(
+        Comment(post=post, author=user, text=f'Комментарий {i}')
+        for i in range(total)
+    )
+    Post.objects.filter(pk=post.pk).update(comment_count=total)
+    expected = list(
+        Comment.objects.filter(post=post)
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)
+    )
+
+    url = f'/posts/{post.id}/'
+    pages = []
+    query = ''
+    while True:
+        comments = user_client.get(url + query).context['comments']
+        pages.append([comment.id for comment in comments])
+        if not comments.has_previous():
+            break
+        query = f'?comments_before={comments.previous_cursor()}'
+
+    assert pages[0] == expected[-NUMBER_COMMENTS_LIST:], (
+        'Убедитесь, что на странице публикации выводятся '
+        f'{NUMBER_COMMENTS_LIST} последних комментариев.'
+    )
+    assert sum(pages[::-1], []) == expected, (
+        'Убедитесь, что по ссылке «Показать предыдущие комментарии» '
+        'загружаются более ранние комментарии без пропусков и повторов.'
+    )
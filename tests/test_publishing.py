@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import maintenance
+from blog.maintenance import publish_scheduled
+from blog.models import Job, Post
+from blog.querysets import posts_filter_full
+from blog.signals import posts_published
+
+pytestmark = [pytest.mark.django_db]
+
+
+def is_visible(post):
+    return Post.objects.values_list('is_visible', flat=True).get(pk=post.pk)
+
+
+def test_visibility_computed_on_save(
+        post_with_published_location,
+        future_posts,
+        posts_with_unpublished_category,
+        unpublished_posts_with_published_locations,
+):
+    assert is_visible(post_with_published_location)
+    for post in (
+        future_posts
+        + posts_with_unpublished_category
+        + unpublished_posts_with_published_locations
+    ):
+        assert not is_visible(post), (
+            'Убедитесь, что в лентах видны только опубликованные посты '
+            'опубликованных категорий с наступившей датой публикации.'
+        )
+
+
+def test_publish_scheduled(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert publish_scheduled() == []
+
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    assert post not in posts_filter_full()
+
+    call_command('publish_scheduled')
+    assert post in posts_filter_full(), (
+        'Убедитесь, что команда `publish_scheduled` открывает в лентах '
+        'отложенные публикации, время которых наступило.'
+    )
+    assert publish_scheduled() == []
+
+
+def test_category_toggle_updates_visibility(post_with_published_location):
+    post = post_with_published_location
+    category = post.category
+
+    category.is_published = False
+    category.save()
+    assert not is_visible(post)
+
+    category.is_published = True
+    category.save()
+    assert is_visible(post)
+
+    category.delete()
+    assert not is_visible(post)
+
+
+def test_category_rename_defers_post_updates(post_with_published_location):
+    post = post_with_published_location
+    updated_at = Post.objects.get(pk=post.pk).updated_at
+    Post.objects.filter(pk=post.pk).update(is_visible=False)
+
+    category = post.category
+    category.title = 'Новое название'
+    category.save()
+    saved = Post.objects.get(pk=post.pk)
+    assert not saved.is_visible, (
+        'Убедитесь, что видимость публикаций пересчитывается только при '
+        'изменении `is_published` категории.'
+    )
+    assert saved.updated_at == updated_at, (
+        'Убедитесь, что `updated_at` публикаций категории обновляется '
+        'фоновой задачей, а не при сохранении категории.'
+    )
+    assert Job.objects.filter(
+        name='touch_posts', payload={'category_id': category.pk}
+    ).exists()
+
+
+def test_refresh_visibility(post_with_published_location, future_posts):
+    Post.objects.update(is_visible=False)
+    call_command('publish_scheduled', refresh=True)
+    assert is_visible(post_with_published_location)
+    assert not any(is_visible(post) for post in future_posts)
+
+
+def test_publish_scheduled_rechecks_visibility(
+        monkeypatch, mixer, user, published_category
+):
+    pub_date = timezone.now() - timedelta(seconds=1)
+    posts = [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=pub_date, is_visible=False,
+        )
+        for _ in range(3)
+    ]
+    Post.objects.update(is_visible=False)
+    sent = []
+
+    def receiver(sender, post_ids, **kwargs):
+        sent.append(post_ids)
+
+    posts_published.connect(receiver)
+    batches = maintenance.batches
+
+    def unpublishing_batches(queryset, batch_size):
+        # Публикацию снимают между выборкой идентификаторов и UPDATE.
+        for ids in batches(queryset, batch_size):
+            Post.objects.filter(pk=posts[0].pk).update(is_published=False)
+            yield ids
+
+    monkeypatch.setattr(maintenance, 'batches', unpublishing_batches)
+    try:
+        published = publish_scheduled(batch_size=2)
+    finally:
+        posts_published.disconnect(receiver)
+    assert not is_visible(posts[0]), (
+        'Убедитесь, что `publish_scheduled` не открывает публикацию, '
+        'снятую с публикации во время работы.'
+    )
+    assert sorted(published) == [posts[1].pk, posts[2].pk]
+    assert len(sent) == 2, (
+        'Убедитесь, что `publish_scheduled` обрабатывает публикации '
+        'пачками и отправляет сигнал для каждой пачки.'
+    )
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+DATASET_SIZES = (1, 10, 100, 1000)
+
+
+def create_posts(n, author, category):
+    now = timezone.now()
+    Location.objects.bulk_create(
+        Location(name=f'Место {i}') for i in range(n)
+    )
+    locations = Location.objects.order_by('-id')[:n]
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {i}',
+            text='Текст публикации',
+            pub_date=now - timedelta(minutes=i),
+            author=author,
+            category=category,
+            is_visible=True,
+            location=location,
+        )
+        for i, location in enumerate(locations)
+    )
+
+
+def count_queries(client, url):
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.parametrize(
+    'url_name', ('index', 'category_posts', 'profile')
+)
+def test_feed_query_count_is_bounded(user_client, user, url_name):
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='category'
+    )
+    url = {
+        'index': '/',
+        'category_posts': f'/category/{category.slug}/',
+        'profile': f'/profile/{user.username}/',
+    }[url_name]
+
+    counts = []
+    created = 0
+    for size in DATASET_SIZES:
+        create_posts(size - created, user, category)
+        created = size
+        counts.append(count_queries(user_client, url))
+
+    assert len(set(counts)) == 1, (
+        f'Убедитесь, что количество запросов к БД на странице `{url}` '
+        'не зависит от количества публикаций: '
+        f'{dict(zip(DATASET_SIZES, counts))}.'
+    )
+
+
+@pytest.mark.parametrize('viewer', ('author', 'visitor'))
+def test_profile_lists_posts_once(
+        user_client, another_user_client, user, post_with_published_location,
+        viewer
+):
+    client = user_client if viewer == 'author' else another_user_client
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        client.get(f'/profile/{user.username}/')
+    post_selects = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT "blog_post"."id"')
+    ]
+    assert len(post_selects) == 1, (
+        'Убедитесь, что страница профиля загружает публикации автора '
+        'одним запросом, без отдельной проверки авторства.'
+    )
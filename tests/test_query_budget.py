@@ -0,0 +1,82 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+from blog.middleware import (
+    QueryBudgetExceeded, get_query_stats, reset_query_stats
+)
+
+pytestmark = [pytest.mark.django_db]
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries, (\d+) duplicates"'
+)
+
+
+@pytest.fixture(autouse=True)
+def query_stats():
+    reset_query_stats()
+    yield
+    reset_query_stats()
+
+
+def get_urls(post):
+    return {
+        'blog:index': '/',
+        'blog:category_posts': f'/category/{post.category.slug}/',
+        'blog:profile': f'/profile/{post.author.username}/',
+        'blog:post_detail': f'/posts/{post.id}/',
+    }
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+def test_views_fit_query_budgets(
+        user_client, another_user_client, client,
+        many_posts_with_published_locations, comment_to_a_post
+):
+    post = many_posts_with_published_locations[0]
+    for view_name, url in get_urls(post).items():
+        for http_client in (user_client, another_user_client, client):
+            response = http_client.get(url)
+            assert response.status_code == 200, (
+                f'Убедитесь, что страница `{view_name}` укладывается '
+                'в бюджет запросов к БД.'
+            )
+
+
+def test_server_timing_header(user_client, post_with_published_location):
+    response = user_client.get('/')
+    match = SERVER_TIMING.fullmatch(response['Server-Timing'])
+    assert match, (
+        'Убедитесь, что ответ содержит заголовок `Server-Timing` '
+        'со временем и числом запросов к БД.'
+    )
+    assert int(match.group(1)) > 0
+
+
+def test_query_stats_by_view(user_client, post_with_published_location):
+    for url in get_urls(post_with_published_location).values():
+        user_client.get(url)
+        user_client.get(url)
+
+    stats = get_query_stats()
+    for view_name in get_urls(post_with_published_location):
+        assert stats[view_name]['requests'] == 2
+        assert stats[view_name]['queries'] > 0
+
+
+@override_settings(
+    QUERY_BUDGETS={'blog:index': 1}, QUERY_BUDGET_STRICT=True
+)
+def test_budget_exceeded(user_client):
+    with pytest.raises(QueryBudgetExceeded):
+        user_client.get('/')
+
+
+@override_settings(
+    QUERY_BUDGETS={'blog:index': 1}, QUERY_BUDGET_STRICT=False
+)
+def test_budget_exceeded_is_logged(user_client, caplog):
+    assert user_client.get('/').status_code == 200
+    assert 'blog:index' in caplog.text
@@ -0,0 +1,111 @@
+from copy import copy
+
+import pytest
+from django.http import HttpResponse
+from django.test.client import Client
+from django.utils import timezone
+
+from blog.middleware import REPLICA_PIN_COOKIE, ReplicaPinningMiddleware
+from blog.models import Post
+from blog.routers import ReplicaRouter
+
+pytestmark = [pytest.mark.django_db(databases=['default', 'replica'])]
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+
+def replicate(*objects):
+    for obj in objects:
+        type(obj).objects.using('replica').bulk_create([copy(obj)])
+
+
+@pytest.fixture
+def post(user, published_category):
+    post = Post.objects.create(
+        title='Публикация', text='Текст', author=user,
+        category=published_category, pub_date=timezone.now(),
+    )
+    replicate(user, published_category, post)
+    return post
+
+
+def test_reads_go_to_replica(client, post):
+    fresh = Post.objects.create(
+        title='Новая', text='Текст', author=post.author,
+        category=post.category, pub_date=timezone.now(),
+    )
+    assert client.get(f'/posts/{post.id}/').status_code == 200
+    assert client.get(f'/posts/{fresh.id}/').status_code == 404, (
+        'Убедитесь, что GET-запросы читают публикации из реплики.'
+    )
+    assert Post.objects.filter(pk=fresh.id).exists(), (
+        'Убедитесь, что вне запросов чтения идут в основную базу.'
+    )
+
+
+def test_author_reads_own_writes(user_client, another_user, post):
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', {'text': 'Свежий комментарий'}
+    )
+    assert response.status_code == 302
+    cookie = response.cookies[REPLICA_PIN_COOKIE]
+    assert cookie['max-age'] == 5
+
+    content = user_client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert 'Свежий комментарий' in content, (
+        'Убедитесь, что после записи пользователь читает из основной базы '
+        'и видит свой комментарий.'
+    )
+
+    replicate(another_user)
+    other_client = Client()
+    other_client.force_login(another_user)
+    content = other_client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert 'Свежий комментарий' not in content, (
+        'Убедитесь, что остальные пользователи читают из реплики.'
+    )
+
+
+def test_safe_requests_without_writes_are_not_pinned(client, post):
+    response = client.get(f'/posts/{post.id}/')
+    assert REPLICA_PIN_COOKIE not in response.cookies
+
+
+def test_one_replica_per_request(settings, rf):
+    settings.DATABASE_REPLICAS = [f'replica_{i}' for i in range(10)]
+    router = ReplicaRouter()
+
+    def view(request):
+        return HttpResponse(','.join(
+            router.db_for_read(Post) for _ in range(20)
+        ))
+
+    middleware = ReplicaPinningMiddleware(view)
+    chosen = set()
+    for _ in range(20):
+        aliases = set(middleware(rf.get('/')).content.decode().split(','))
+        assert len(aliases) == 1, (
+            'Убедитесь, что все чтения одного запроса идут в одну реплику.'
+        )
+        chosen |= aliases
+    assert len(chosen) > 1
+
+
+def test_lagging_replica_does_not_fill_shared_caches(client, post):
+    client.get('/')
+    fresh = Post.objects.create(
+        title='Свежая публикация', text='Текст', author=post.author,
+        category=post.category, pub_date=timezone.now(),
+    )
+    for _ in range(2):
+        response = client.get('/')
+        assert fresh.title in response.content.decode('utf-8'), (
+            'Убедитесь, что общий кеш страниц не заполняется данными '
+            'из отстающей реплики.'
+        )
+    etag = response['ETag']
+    replicate(fresh)
+    assert client.get('/', HTTP_IF_NONE_MATCH=etag).status_code == 304
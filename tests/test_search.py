@@ -0,0 +1,105 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import TRIGGERS, install_search, search_ids
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(user, published_category):
+    def make(title='Заголовок', text='Текст', **kwargs):
+        kwargs.setdefault('pub_date', timezone.now())
+        return Post.objects.create(
+            title=title, text=text, author=user, category=published_category,
+            **kwargs
+        )
+    return make
+
+
+def found(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_search_ranks_title_above_text(client, make_post):
+    in_text = make_post(text='Рецепт вишнёвого пирога')
+    in_title = make_post(title='Пирог с вишней')
+    make_post(title='Про другое')
+    assert found(client, 'пирог') == [in_title.id, in_text.id], (
+        'Убедитесь, что поиск находит публикации по заголовку и тексту '
+        'и ставит совпадения в заголовке выше.'
+    )
+
+
+def test_search_honors_visibility(client, make_post):
+    visible = make_post(title='Закат')
+    make_post(title='Закат', is_published=False)
+    make_post(title='Закат', pub_date=timezone.now().replace(year=2999))
+    assert found(client, 'закат') == [visible.id], (
+        'Убедитесь, что поиск не показывает скрытые и отложенные '
+        'публикации.'
+    )
+
+
+def test_search_index_follows_changes(
+        client, make_post, user, published_category
+):
+    post = make_post(title='Старое название')
+    post.title = 'Новое название'
+    post.save()
+    assert found(client, 'новое') == [post.id]
+    assert found(client, 'старое') == []
+
+    Post.objects.bulk_create([Post(
+        title='Массовая вставка', text='Текст', author=user,
+        category=published_category, pub_date=timezone.now(),
+        is_visible=True,
+    )])
+    assert len(found(client, 'массовая')) == 1
+
+    post.delete()
+    assert found(client, 'новое') == []
+
+
+def test_search_keyset_pagination(user_client, make_post):
+    for i in range(25):
+        make_post(title=f'Море {i}', text='море ' * (i % 4))
+    expected = [pk for pk, _ in search_ids('море', limit=100)]
+
+    ids, query = [], {'q': 'море'}
+    while True:
+        page = user_client.get('/search/', query).context['page_obj']
+        ids += [post.id for post in page]
+        if not page.has_next():
+            break
+        query = {'q': 'море', 'after': page.next_cursor()}
+    assert ids == expected and len(ids) == 25, (
+        'Убедитесь, что страницы поиска идут по курсору без пропусков '
+        'и повторов.'
+    )
+
+
+@pytest.mark.parametrize(
+    'query', ('"', 'NEAR(море', 'море AND OR', '*', '   ', 'title:море')
+)
+def test_search_escapes_query_syntax(client, make_post, query):
+    make_post(title='Море')
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+
+
+def test_install_search_rebuilds_after_lost_triggers(client, make_post):
+    with connection.cursor() as cursor:
+        for trigger in TRIGGERS:
+            cursor.execute(f'DROP TRIGGER {trigger}')
+    post = make_post(title='Потерянный триггер')
+    assert found(client, 'потерянный') == []
+
+    install_search()
+    cache.clear()
+    assert found(client, 'потерянный') == [post.id]
@@ -0,0 +1,127 @@
+import re
+from datetime import timedelta
+from xml.etree import ElementTree
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import sitemaps
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+NS = {'sm': sitemaps.XMLNS}
+
+
+def read(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('application/xml')
+    content = b''.join(response) if response.streaming else response.content
+    return ElementTree.fromstring(content)
+
+
+def locations(root, tag):
+    return [
+        re.sub(r'^http://testserver', '', loc.text)
+        for loc in root.findall(f'sm:{tag}/sm:loc', NS)
+    ]
+
+
+@pytest.fixture
+def many_posts(user, published_category):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {i}', text='Текст', author=user,
+            category=published_category, pub_date=now - timedelta(hours=i),
+            is_visible=True,
+        )
+        for i in range(7)
+    )
+    hidden = Post.objects.order_by('id').first()
+    Post.objects.filter(pk=hidden.pk).update(is_visible=False)
+    return hidden
+
+
+def test_sitemap_shards_cover_visible_urls(
+        client, monkeypatch, many_posts, user, published_category
+):
+    monkeypatch.setattr(sitemaps, 'SITEMAP_LIMIT', 3)
+    shards = locations(read(client, '/sitemap.xml'), 'sitemap')
+    assert any('sitemap-posts-' in shard for shard in shards)
+
+    urls = []
+    for shard in shards:
+        shard_urls = locations(read(client, shard), 'url')
+        assert len(shard_urls) <= 3, (
+            'Убедитесь, что в одном файле карты сайта не больше '
+            'SITEMAP_LIMIT адресов.'
+        )
+        urls += shard_urls
+
+    visible = Post.objects.filter(is_visible=True).order_by('id')
+    expected = [f'/posts/{post.id}/' for post in visible] + [
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    ]
+    assert urls == expected, (
+        'Убедитесь, что карта сайта содержит видимые публикации, '
+        'категории и профили авторов, и только их.'
+    )
+    assert f'/posts/{many_posts.id}/' not in urls
+
+
+def test_sitemap_lastmod_and_cache(client, many_posts):
+    post = Post.objects.filter(is_visible=True).order_by('id').first()
+    root = read(client, '/sitemap-posts-0.xml')
+    lastmod = root.find('sm:url/sm:lastmod', NS).text
+    assert lastmod == post.updated_at.isoformat(timespec='seconds')
+
+    with CaptureQueriesContext(connection) as context:
+        read(client, '/sitemap-posts-0.xml')
+    assert not context.captured_queries, (
+        'Убедитесь, что шард карты сайта отдаётся из кеша.'
+    )
+
+    post.is_published = False
+    post.save()
+    assert f'/posts/{post.id}/' not in locations(
+        read(client, '/sitemap-posts-0.xml'), 'url'
+    ), 'Убедитесь, что кеш карты сайта сбрасывается при изменении публикаций.'
+
+
+def test_sitemap_conditional_get(client, many_posts):
+    etag = client.get('/sitemap.xml')['ETag']
+    assert client.get(
+        '/sitemap.xml', HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+
+
+def test_unknown_sitemap_section(client):
+    assert client.get('/sitemap-unknown-0.xml').status_code == 404
+
+
+def test_sitemap_etag_follows_cache(client, many_posts):
+    url = '/sitemap-posts-0.xml'
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # lastmod меняется без POSTS_VERSION, затем кеш файла истекает.
+    Post.objects.update(updated_at=timezone.now() + timedelta(hours=1))
+    key = sitemaps.sitemap_key('http://testserver', 'posts', 0)
+    cache.delete_many([key, f'{key}:generation'])
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что ETag карты сайта меняется вместе с её кешем.'
+    )
+
+
+def test_sitemap_shard_beyond_last(client, many_posts):
+    assert client.get('/sitemap-posts-1.xml').status_code == 404, (
+        'Убедитесь, что для несуществующего шарда карта сайта '
+        'отвечает 404.'
+    )
@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test.utils import override_settings
+
+from blogicum import settings_production
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_production_pragmas_applied_on_connect(tmp_path):
+    database = DatabaseWrapper(
+        {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')}
+    )
+    with override_settings(SQLITE_PRAGMAS=settings_production.SQLITE_PRAGMAS):
+        database.ensure_connection()
+    try:
+        def pragma(name):
+            return database.connection.execute(
+                f'PRAGMA {name}'
+            ).fetchone()[0]
+
+        assert pragma('journal_mode') == 'wal', (
+            'Убедитесь, что профиль продакшена включает для SQLite режим WAL.'
+        )
+        assert pragma('synchronous') == 1
+        assert pragma('busy_timeout') == 5000
+        assert pragma('cache_size') == -64 * 1024
+    finally:
+        database.close()
+
+
+def test_production_keeps_connections():
+    assert settings_production.DATABASES['default']['CONN_MAX_AGE'] > 0
+    assert not settings_production.DEBUG
@@ -0,0 +1,156 @@
+import hashlib
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import thumbnail_names
+from blog.jobs import run_pending
+from blog.maintenance import image_storage
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.ORPHAN_IMAGE_GRACE_PERIOD = 0
+
+
+def image_bytes(color='green'):
+    data = BytesIO()
+    Image.new('RGB', (64, 64), color).save(data, 'JPEG')
+    return data.getvalue()
+
+
+def set_image(post, content, name='photo.JPG'):
+    post.image.save(name, ContentFile(content))
+    run_pending()
+    post.refresh_from_db()
+
+
+def stored_files():
+    storage = image_storage()
+    names = []
+    directories, _ = storage.listdir('post_images')
+    for directory in directories:
+        _, files = storage.listdir(f'post_images/{directory}')
+        names += [f'post_images/{directory}/{file}' for file in files]
+    return sorted(names)
+
+
+def test_image_is_stored_by_content_hash(post_with_published_location):
+    content = image_bytes()
+    set_image(post_with_published_location, content)
+    digest = hashlib.sha256(content).hexdigest()
+    assert post_with_published_location.image.name == (
+        f'post_images/{digest[:2]}/{digest}.jpg'
+    ), 'Убедитесь, что картинка сохраняется под именем из хеша содержимого.'
+
+
+def test_same_image_is_stored_once(user, post_with_published_location):
+    first = post_with_published_location
+    second = Post.objects.create(
+        title='Копия', text='Текст', pub_date=first.pub_date,
+        author=user, category=first.category,
+    )
+    content = image_bytes()
+    set_image(first, content, 'one.jpg')
+    set_image(second, content, 'two.jpg')
+
+    assert first.image.name == second.image.name
+    originals = [
+        name for name in stored_files()
+        if name not in thumbnail_names(first.image.name)
+    ]
+    assert originals == [first.image.name], (
+        'Убедитесь, что одинаковые картинки хранятся в одном файле.'
+    )
+
+
+def test_replaced_image_is_collected(post_with_published_location):
+    post = post_with_published_location
+    set_image(post, image_bytes('green'))
+    old_name = post.image.name
+
+    set_image(post, image_bytes('red'))
+    run_pending()
+    assert stored_files() == sorted(
+        [post.image.name] + thumbnail_names(post.image.name)
+    ), (
+        'Убедитесь, что заменённая картинка и её копии удаляются, '
+        'когда на них больше не ссылается ни одна публикация.'
+    )
+    assert old_name not in stored_files()
+
+
+def test_shared_image_survives_post_deletion(
+        user, post_with_published_location
+):
+    first = post_with_published_location
+    second = Post.objects.create(
+        title='Копия', text='Текст', pub_date=first.pub_date,
+        author=user, category=first.category,
+    )
+    content = image_bytes()
+    set_image(first, content)
+    set_image(second, content)
+
+    first.delete()
+    run_pending()
+    assert second.image.name in stored_files()
+
+    second.delete()
+    run_pending()
+    assert stored_files() == []
+
+
+def test_collect_orphan_images(post_with_published_location):
+    post = post_with_published_location
+    set_image(post, image_bytes())
+    orphan = image_storage().save('post_images/orphan.jpg', ContentFile(
+        image_bytes('blue')
+    ))
+
+    call_command('collect_orphan_images', dry_run=True)
+    assert orphan in stored_files()
+
+    call_command('collect_orphan_images')
+    assert orphan not in stored_files()
+    assert post.image.name in stored_files()
+    assert all(
+        name in stored_files() for name in thumbnail_names(post.image.name)
+    )
+
+
+def test_derived_names_are_kept():
+    storage = image_storage()
+    name = storage.save('post_images/photo.jpg', ContentFile(image_bytes()))
+    thumbnail = thumbnail_names(name)[0]
+    assert storage.save(thumbnail, ContentFile(b'thumbnail')) == thumbnail, (
+        'Убедитесь, что копии картинки сохраняются под именем, '
+        'выведенным из имени оригинала.'
+    )
+
+
+def test_file_collected_during_save_is_written_again(monkeypatch):
+    storage = image_storage()
+    content = image_bytes()
+    name = storage.save('post_images/photo.jpg', ContentFile(content))
+    exists = storage.exists
+
+    def collected_after_check(path):
+        found = exists(path)
+        storage.delete(path)
+        return found
+
+    monkeypatch.setattr(storage, 'exists', collected_after_check)
+    assert storage.save('post_images/photo.jpg', ContentFile(content)) == name
+    monkeypatch.undo()
+    assert storage.exists(name), (
+        'Убедитесь, что файл, удалённый сборщиком мусора во время '
+        'сохранения, записывается заново.'
+    )
@@ -0,0 +1,103 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import THUMBNAIL_WIDTHS, thumbnail_name, thumbnail_names
+from blog.jobs import run_pending
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def upload(name='photo.jpg', size=(1200, 800)):
+    data = BytesIO()
+    Image.new('RGB', size, 'green').save(data, 'JPEG')
+    return SimpleUploadedFile(name, data.getvalue(), 'image/jpeg')
+
+
+def save_image(post, *args, **kwargs):
+    post.image = upload(*args, **kwargs)
+    post.save()
+    run_pending()
+    post.refresh_from_db()
+
+
+def test_thumbnails_created_by_worker(post_with_published_location):
+    post = post_with_published_location
+    post.image = upload()
+    post.save()
+    assert not default_storage.exists(
+        thumbnail_name(post.image.name, THUMBNAIL_WIDTHS[0], 'jpg')
+    ), 'Убедитесь, что картинки уменьшаются не в запросе, а воркером.'
+
+    run_pending()
+    post.refresh_from_db()
+    assert post.has_thumbnails
+    for width in THUMBNAIL_WIDTHS:
+        for extension in ('jpg', 'webp'):
+            name = thumbnail_name(post.image.name, width, extension)
+            assert default_storage.exists(name), (
+                'Убедитесь, что при загрузке картинки публикации создаются '
+                f'уменьшенные копии: нет файла `{name}`.'
+            )
+            with default_storage.open(name) as file:
+                assert Image.open(file).width == width
+
+
+def test_small_image_is_not_upscaled(post_with_published_location):
+    post = post_with_published_location
+    save_image(post, size=(100, 100))
+    name = thumbnail_name(post.image.name, THUMBNAIL_WIDTHS[-1], 'webp')
+    with default_storage.open(name) as file:
+        assert Image.open(file).size == (100, 100)
+
+
+def test_post_card_uses_srcset(client, post_with_published_location):
+    post = post_with_published_location
+    save_image(post)
+
+    content = client.get('/').content.decode('utf-8')
+    assert post.image_srcset in content
+    assert post.image_webp_srcset in content
+    assert f'src="{post.image.url}"' not in content, (
+        'Убедитесь, что в карточке публикации выводится уменьшенная копия '
+        'картинки, а не оригинал.'
+    )
+
+
+def test_replaced_image_gets_new_thumbnails(post_with_published_location):
+    post = post_with_published_location
+    save_image(post, 'first.jpg')
+    save_image(post, 'second.jpg')
+    assert post.has_thumbnails
+    assert all(
+        default_storage.exists(name)
+        for name in thumbnail_names(post.image.name)
+    )
+
+
+def test_backfill_command(post_with_published_location):
+    post = post_with_published_location
+    save_image(post)
+    names = thumbnail_names(post.image.name)
+    for name in names:
+        default_storage.delete(name)
+    Post.objects.filter(pk=post.pk).update(thumbnails_image='')
+
+    call_command('generate_thumbnails', processes=2)
+
+    post.refresh_from_db()
+    assert post.has_thumbnails
+    assert all(default_storage.exists(name) for name in names), (
+        'Убедитесь, что команда `generate_thumbnails` создаёт уменьшенные '
+        'копии для уже загруженных картинок.'
+    )